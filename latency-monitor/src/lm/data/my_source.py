@@ -1,11 +1,55 @@
 # src/lm/data/my_source.py
+import os
 import pandas as pd
 
+# pyarrow es opcional: si está, el CSV se tokeniza una sola vez a una Arrow Table
+PYARROW_OK = False
+try:
+    import pyarrow.csv as pacsv
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    PYARROW_OK = True
+except Exception:
+    pass
+
+CSV_PATH = "data/trades.csv"
+PARQUET_PATH = "data/trades.parquet"
+_cache = {"mtime": None, "table": None}
+
+def _load_trades():
+    """Devuelve la tabla cacheada; solo se vuelve a parsear si el CSV cambió (mtime)."""
+    mtime = os.path.getmtime(CSV_PATH)
+    if _cache["mtime"] != mtime:
+        _cache["table"] = pacsv.read_csv(CSV_PATH) if PYARROW_OK else pd.read_csv(CSV_PATH)
+        _cache["mtime"] = mtime
+    return _cache["table"]
+
+def convert_trades_to_parquet(row_group_size: int = 50_000) -> None:
+    """Conversión única CSV -> Parquet (strings con diccionario y estadísticas por row group)."""
+    pd.read_csv(CSV_PATH).to_parquet(PARQUET_PATH, row_group_size=row_group_size)
+
+def _parquet_fresh() -> bool:
+    """El Parquet solo vale si no es más antiguo que el CSV; si el CSV cambió después, se lee el CSV."""
+    if not os.path.isfile(PARQUET_PATH):
+        return False
+    return not os.path.isfile(CSV_PATH) or os.path.getmtime(PARQUET_PATH) >= os.path.getmtime(CSV_PATH)
+
 def my_fetch(bis: int | None) -> pd.DataFrame:
     # Ejemplo de uso del parámetro BIS
     # Si bis es None o 0, carga todo; si es un número, filtra por algo
-    df = pd.read_csv("data/trades.csv")
+    if PYARROW_OK and _parquet_fresh():
+        # Parquet: el filtro se empuja al lector y se saltan row groups por sus estadísticas
+        filters = [("Quantity", ">", bis)] if bis else None
+        return pq.read_table(PARQUET_PATH, filters=filters).to_pandas()
+
+    tbl = _load_trades()
+
+    if PYARROW_OK:
+        if bis:
+            tbl = tbl.filter(pc.greater(tbl["Quantity"], bis))  # filtro en kernels de Arrow
+        return tbl.to_pandas()
 
+    df = tbl.copy(deep=False)  # no exponer el DataFrame cacheado
     if bis:
         df = df[df["Quantity"] > bis]  # solo ejemplo de filtro usando BIS
 
@@ -2,64 +2,148 @@
 import pandas as pd
 from typing import Optional
 from .provider import DataProvider
-import random, math
-from datetime import datetime, timedelta
+import numpy as np
+from datetime import datetime
+from functools import lru_cache
 import logging
 logger = logging.getLogger("LatencyMonitor")
 from typing import Optional, Dict, List, Tuple, Any
 
-def simulate_tsla_quotes(n_rows: int = 240, seed: Optional[int] = None) -> pd.DataFrame:
+from lm.utils.jit import numba_kernel, use_jit
+
+# Strings de alta cardinalidad (ISIN, Time) respaldados por Arrow si pyarrow está instalado
+_STR_DTYPE = None
+try:
+    import pyarrow  # noqa: F401
+    _STR_DTYPE = pd.StringDtype("pyarrow")
+except Exception:
+    pass
+
+# numba es opcional: solo acelera el diff por grupo cuando n es grande
+@numba_kernel
+def _group_diff_jit(numba):
+    @numba.njit(cache=True)
+    def kernel(times_i8, codes, out):
+        out[0] = 0
+        for i in range(1, times_i8.shape[0]):
+            out[i] = 0 if codes[i] != codes[i - 1] else times_i8[i] - times_i8[i - 1]
+    return kernel
+
+def _sorted_group_diff(times_i8: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """Diff de times_i8 (ordenado por (codes, tiempo)) con 0 donde empieza cada grupo."""
+    out = np.empty(times_i8.shape[0], dtype=np.int64)
+    if use_jit(out.shape[0]):
+        _group_diff_jit()(times_i8, codes, out)
+        return out
+    out[0] = 0
+    out[1:] = times_i8[1:] - times_i8[:-1]
+    out[1:][codes[1:] != codes[:-1]] = 0
+    return out
+
+def _hhmmss(secs: np.ndarray) -> np.ndarray:
+    """'HH:MM:SS' a partir de segundos epoch (int64), con aritmética entera (sin strftime por fila)."""
+    sod = secs % 86400
+    buf = np.full((sod.shape[0], 8), ord(":"), dtype=np.uint8)
+    for j, v in ((0, sod // 3600), (3, sod // 60 % 60), (6, sod % 60)):
+        buf[:, j] = v // 10 + ord("0")
+        buf[:, j + 1] = v % 10 + ord("0")
+    return buf.view("S8").ravel().astype(str)
+
+def simulate_tsla_quotes(n_rows: int = 240, seed: Optional[int] = None,
+                         rng: Optional[np.random.Generator] = None,
+                         now: Optional[datetime] = None) -> pd.DataFrame:
     """
     Columns:
       Time, nombre (TSLA/NVDA/MSFT), Exchange (A-D), counterparty (H/J/K),
       ISIN, b/s, qty, exec price, PnL, TimeDT, inc_t_s
+    rng: Generator a reutilizar entre llamadas (si se pasa, se ignora seed)
+    now: instante de referencia de TimeDT (por defecto datetime.now())
     """
-    if seed is not None:
-        random.seed(seed)
+    if rng is None:
+        rng = np.random.default_rng(seed)
 
     exchanges = ["A", "B", "C", "D"]
     cps = ["H", "J", "K"]
     sides = ["buy", "sell"]
     nombres = ["TSLA", "NVDA", "MSFT"]
-    now = datetime.now()
+    now = now or datetime.now()
+    n = max(1, int(n_rows))
 
-    rows: List[Dict[str, Any]] = []
     try:
-        for _ in range(max(1, int(n_rows))):
-            tdt = now + timedelta(minutes=random.randint(-120, 120), seconds=random.randint(0, 59))
-            hhmmss = tdt.strftime("%H:%M:%S")
-            nombre = random.choice(nombres)
-            ex = random.choice(exchanges)
-            cp = random.choice(cps)
-            isin = "DE000" + "".join(random.choices("0123456789", k=7))
-            side = random.choice(sides)
-            qty = random.choice([50, 100, 200, 500, 800, 1200])
-            exec_price = round(280 + random.random() * 45, 2)
-            pnl = random.randint(-1000, 100)*0.15
-
-            rows.append({
-                "Time": hhmmss,
-                "nombre": nombre,
-                "Exchange": ex,
-                "counterparty": cp,
-                "ISIN": isin,
-                "b/s": side,
-                "qty": int(qty),
-                "exec price": float(exec_price),
-                "PnL": float(pnl),
-                "TimeDT": tdt,
-            })
+        # Cada columna se genera de una vez como array (sin bucle por fila)
+        minutes = rng.integers(-120, 121, n)
+        secs = rng.integers(0, 60, n)
+        tdt = (np.datetime64(now, "s")
+               + minutes * np.timedelta64(1, "m")
+               + secs * np.timedelta64(1, "s"))
+        # Una sola vista entera de TimeDT (segundos epoch) alimenta Time e inc_t_s
+        epoch_s = tdt.view("i8")
+        # ISIN: prefijo + 7 dígitos ASCII en un buffer (n, 12) visto como bytes de ancho fijo
+        isin_buf = np.empty((n, 12), dtype=np.uint8)
+        isin_buf[:, :5] = np.frombuffer(b"DE000", dtype=np.uint8)
+        isin_buf[:, 5:] = rng.integers(ord("0"), ord("9") + 1, size=(n, 7), dtype=np.uint8)
+        isin = isin_buf.view("S12").ravel().astype(str)
 
-        df = pd.DataFrame(rows)
-        df = df.sort_values(["nombre", "TimeDT"]).reset_index(drop=True)
-        df["inc_t_s"] = df.groupby("nombre")["TimeDT"].diff().dt.total_seconds().fillna(0.0)
-        return df.sample(frac=1.0, random_state=seed).reset_index(drop=True)
+        df = pd.DataFrame({
+            "Time": pd.Series(_hhmmss(epoch_s), dtype=_STR_DTYPE),
+            "nombre": pd.Categorical.from_codes(rng.integers(0, len(nombres), n), categories=nombres),
+            "Exchange": pd.Categorical.from_codes(rng.integers(0, len(exchanges), n), categories=exchanges),
+            "counterparty": pd.Categorical.from_codes(rng.integers(0, len(cps), n), categories=cps),
+            "ISIN": pd.Series(isin, dtype=_STR_DTYPE),
+            "b/s": pd.Categorical.from_codes(rng.integers(0, len(sides), n), categories=sides),
+            "qty": rng.choice(np.array([50, 100, 200, 500, 800, 1200], dtype=np.int32), n),
+            "exec price": np.round(280 + rng.random(n) * 45, 2),
+            "PnL": rng.integers(-1000, 101, n) * 0.15,
+            "TimeDT": tdt,
+        })
+        # Las filas ya salen en orden aleatorio: inc_t_s se calcula en orden
+        # (nombre, TimeDT) y se devuelve a su posición, sin ordenar ni barajar el frame
+        codes = df["nombre"].cat.codes.to_numpy()
+        # Orden (nombre, TimeDT) por cubos: un argsort pequeño por código de categoría
+        buckets = [np.flatnonzero(codes == c) for c in range(len(nombres))]
+        order = np.concatenate([idx[np.argsort(epoch_s[idx], kind="stable")] for idx in buckets])
+        inc = np.empty(n)
+        inc[order] = _sorted_group_diff(epoch_s[order], codes[order])
+        df["inc_t_s"] = inc
+        return df
     except Exception:
         logger.exception("simulate_tsla_quotes failed")
-        cols = ["Time","nombre","Exchange","counterparty","ISIN","b/s","qty","exec price","PnL","TimeDT","inc_t_s"]
-        return pd.DataFrame(columns=cols)
+        # Mismas columnas y dtypes que la salida normal, con arrays vacíos pre-tipados
+        return pd.DataFrame({
+            "Time": pd.Series([], dtype=_STR_DTYPE),
+            "nombre": pd.Categorical([], categories=nombres),
+            "Exchange": pd.Categorical([], categories=exchanges),
+            "counterparty": pd.Categorical([], categories=cps),
+            "ISIN": pd.Series([], dtype=_STR_DTYPE),
+            "b/s": pd.Categorical([], categories=sides),
+            "qty": np.empty(0, dtype=np.int32),
+            "exec price": np.empty(0),
+            "PnL": np.empty(0),
+            "TimeDT": np.empty(0, dtype="datetime64[s]"),
+            "inc_t_s": np.empty(0),
+        })
+
+@lru_cache(maxsize=4)
+def _simulate_cached(n_rows: int, seed: int) -> Tuple[np.datetime64, pd.DataFrame]:
+    """Sorteos deterministas de una semilla junto con el instante (en s) respecto al que se generaron."""
+    now = datetime.now()
+    return np.datetime64(now, "s"), simulate_tsla_quotes(n_rows, seed=seed, now=now)
+
 class SimulatedProvider(DataProvider):
     def __init__(self, n_rows: int = 260, seed: Optional[int] = None):
         self.n_rows, self.seed = n_rows, seed
+        self._rng = np.random.default_rng()  # un solo Generator (PCG64) para todos los fetch sin semilla
     def fetch(self) -> pd.DataFrame:
-        return simulate_tsla_quotes(self.n_rows, seed=self.seed)
+        if self.seed is None:
+            return simulate_tsla_quotes(self.n_rows, rng=self._rng)
+        # Con semilla fija los sorteos son deterministas: se generan una vez y en cada fetch
+        # solo se desplaza TimeDT/Time al instante actual (inc_t_s son diferencias, no cambia).
+        # Copia superficial: el llamador puede añadir columnas sin tocar la caché
+        t0, cached = _simulate_cached(self.n_rows, self.seed)
+        df = cached.copy(deep=False)
+        shift = np.datetime64(datetime.now(), "s") - t0
+        if shift:
+            tdt = df["TimeDT"].to_numpy() + shift
+            df["TimeDT"] = tdt
+            df["Time"] = pd.Series(_hhmmss(tdt.view("i8")), dtype=_STR_DTYPE)
+        return df
@@ -1,19 +1,26 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import logging, os, json, math
+import logging, os, json, math, queue, atexit
+from operator import itemgetter
+from functools import lru_cache
 from datetime import datetime
 import matplotlib.dates as mdates
 
 from lm.utils.numbers import safe_float, safe_int, signed_text
 from lm.utils.debounce import Debouncer
 from lm.utils.popup import popup_df_simple
+from lm.utils.histogram import cum_bin_counts
+from lm.utils.filter_kernel import range_mask, use_range_jit
+from lm.utils.row_tags import ROW_TAGS, row_tag_codes
+from lm.utils.decimate import m4_indices
 from lm.ui.summary_table import SummaryTable
 from lm.data.provider import DataProvider
 from lm.ui.summary_table import CounterpartyVolumeTable
 
 import sys
 from typing import Optional, Dict, List, Tuple, Any
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+from concurrent.futures import ThreadPoolExecutor, Future
 from matplotlib.ticker import FuncFormatter
 
 
@@ -32,10 +39,16 @@ if not logger.handlers:
     ch = logging.StreamHandler(stream=sys.stdout); ch.setLevel(getattr(logging, LOG_LEVEL, logging.DEBUG)); ch.setFormatter(fmt)
     fh = RotatingFileHandler(LOG_FILE, maxBytes=2_000_000, backupCount=3, encoding="utf-8")
     fh.setLevel(getattr(logging, LOG_LEVEL, logging.DEBUG)); fh.setFormatter(fmt)
-    logger.addHandler(ch); logger.addHandler(fh)
+    # El hilo de Tk solo encola el record; escritura y rotación del fichero van en el hilo del listener
+    _log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    _log_listener = QueueListener(_log_queue, ch, fh, respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)  # vacía la cola al salir
+    logger.addHandler(QueueHandler(_log_queue))
 
 # --- Deps ---
 try:
+    import numpy as np
     import pandas as pd
     from pandas.api.types import is_numeric_dtype
 except Exception:
@@ -50,13 +63,58 @@ try:
 except Exception:
     logger.warning("matplotlib not available; charts disabled.")
 
+# numexpr es opcional: fusiona las comparaciones numéricas de los filtros en una pasada
+NUMEXPR_OK = False
+try:
+    import numexpr  # noqa: F401
+    NUMEXPR_OK = True
+except Exception:
+    pass
+
+# pyarrow es opcional: writer CSV multihilo (libera el GIL) para exportar
+PYARROW_OK = False
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    PYARROW_OK = True
+except Exception:
+    pass
+
+
+# horas con tick en los ejes de tiempo. Locator/formatter se crean una vez por eje
+# (en el init perezoso): matplotlib los ata a su eje y no se pueden compartir.
+_ARROW_CSV_MIN_ROWS = 500_000  # por debajo, export con pandas (formato idéntico al de siempre)
+_CHART_HOURS = [8, 10, 12, 14, 16, 18, 20, 22]
+
+# separador de las celdas "rich" de los resúmenes: una sola tupla compartida por todas las filas
+_SEP_MUTED = (" | ", "muted")
+
+@lru_cache(maxsize=64)
+def _day_bounds(y: int, m: int, d: int) -> Tuple["pd.Timestamp", "pd.Timestamp"]:
+    """Ventana 08–22 del día (Timestamps inmutables: se construyen una vez por fecha)."""
+    return pd.Timestamp(y, m, d, 8), pd.Timestamp(y, m, d, 22)
+
+def _fmt_vol(y, pos):
+    if abs(y) >= 1_000_000:
+        return f"{y/1_000_000:.1f}M"
+    return f"{y:,.0f}"
+
 
 class TradesApp(tk.Tk):
     DISPLAY_COLS = ["Time","nombre","Exchange","counterparty","ISIN","b/s","qty","exec price","PnL","inc_t_s"]
+    # Clave estable de fila para el diff del Treeview (subconjunto de DISPLAY_COLS)
+    ROW_KEY_COLS = ("Time","ISIN","counterparty","b/s","qty")
+    # posiciones de la clave dentro de la fila mostrada, resueltas una vez (itemgetter -> tupla en C)
+    _row_key = staticmethod(itemgetter(*map(DISPLAY_COLS.index, ROW_KEY_COLS)))
+    SKIP_FILTER_COLS = frozenset({"Time", "TimeDT"})
+    NUMERIC_COLS = ("qty", "exec price", "PnL", "inc_t_s")
+    _FETCH_POLL_MS = 50  # cada cuánto mira el hilo de Tk si el fetch en background terminó
+    _TREE_BULK_ROWS = 200  # a partir de cuántas filas tocadas se quitan las columnas del Treeview durante el diff
 
     def __init__(self, provider: DataProvider, refresh_ms: int = 5000, settings_path: str | None = None):
         super().__init__()
         self.provider = provider
+        self._fetch = provider.fetch  # bound method resuelto una vez (se llama en cada refresh)
         
         self._ui_ready = False  # <-- evita redibujar antes de tener widgets
         self.title("Market Maker — Live Latency Monitor")
@@ -99,25 +157,47 @@ class TradesApp(tk.Tk):
             
 
         # ---------- STATE ----------
-        df = self.provider.fetch()
+        df = self._fetch()
         expected = set(self.DISPLAY_COLS + ["TimeDT"])
         for c in expected:
             if c not in df.columns:
                 logger.warning("Missing column %s in initial df; creating empty.", c)
                 df[c] = []
-        self.df_all = df.copy()
-        self.df_filtered = df.copy()
+        # df_all/df_filtered se tratan como snapshots inmutables: se reasignan, nunca se mutan,
+        # así que comparten bloques en vez de copiarlos
+        df = self._normalize_dtypes(df)
+        self.df_all = df
+        self.df_filtered = df
 
         # Tk variables (vinculadas a settings)
         self.refresh_ms = tk.IntVar(value=int(refresh_ms))
         self.running = tk.BooleanVar(value=True)
+        # provider.fetch() corre en un worker para no bloquear el mainloop de Tk
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lm-fetch")
+        self._fetch_future: Optional[Future] = None
         self.sort_state_main: Dict[str, bool] = {}
+        # Treeview incremental: clave de fila -> iid, e iid -> (values, tags) mostrados
+        self._row_iids: Dict[tuple, str] = {}
+        self._row_shown: Dict[str, tuple] = {}
+        # filas ya materializadas (tuplas) + hash por fila, para convertir solo la cola nueva
+        self._rows_cache: Tuple[np.ndarray, List[tuple]] = (np.empty(0, dtype=np.uint64), [])
+        # KPIs acumulados sobre esas filas: (n, pos_sum, n_pos, neg_sum, n_neg, volumen)
+        self._kpi_cache: tuple = (0, 0.0, 0, 0.0, 0, 0)
+        self._chart_cache: Dict[str, Any] = {}  # TimeDT preparado de df_filtered, compartido por los charts
+        self._blit_bg: Dict[Any, tuple] = {}  # ax -> ((xlim, ylim), fondo sin líneas) para blitting
+        self._last_view_sig: Optional[tuple] = None  # firma de lo último pintado (update_all_views)
+        self._summary_sig: Optional[tuple] = None  # firma de df_all en el último update_global_summaries
         # Debounce config
         self._debouncer = Debouncer(self)
         self._filter_debounce_ms = 200  # ajusta en settings si quieres
 
         self.hl_qty = tk.StringVar(value="800")
         self.hl_pnl = tk.StringVar(value="0")
+        # umbrales ya parseados; se recalculan solo cuando cambia el texto (no en cada refresh)
+        self._hl_qty_f = self._hl_pnl_f = float("inf")
+        self._update_hl_thresholds()
+        for v in (self.hl_qty, self.hl_pnl):
+            v.trace_add("write", self._update_hl_thresholds)
 
         self.bis_var  = tk.StringVar(value="")     # NEW: BIS variable editable
 
@@ -154,10 +234,10 @@ class TradesApp(tk.Tk):
         hl_card = ttk.Frame(self.left_frame, style="Card.TFrame"); hl_card.pack(fill=tk.X, padx=4, pady=(0,8))
         ttk.Label(hl_card, text="Highlight if:  qty >", font=("Segoe UI",10,"bold")).pack(side=tk.LEFT, padx=(10,4))
         e_hl_qty = ttk.Entry(hl_card, width=8, textvariable=self.hl_qty)
-        e_hl_qty.pack(side=tk.LEFT, padx=(0,12)); e_hl_qty.bind("<Return>", lambda e: self.update_all_views()); e_hl_qty.bind("<FocusOut>", lambda e: self.update_all_views())
+        e_hl_qty.pack(side=tk.LEFT, padx=(0,12)); e_hl_qty.bind("<Return>", self._schedule_render); e_hl_qty.bind("<FocusOut>", self._schedule_render)
         ttk.Label(hl_card, text="AND   PnL >", font=("Segoe UI",10,"bold")).pack(side=tk.LEFT, padx=(6,4))
         e_hl_pnl = ttk.Entry(hl_card, width=8, textvariable=self.hl_pnl)
-        e_hl_pnl.pack(side=tk.LEFT, padx=(0,12)); e_hl_pnl.bind("<Return>", lambda e: self.update_all_views()); e_hl_pnl.bind("<FocusOut>", lambda e: self.update_all_views())
+        e_hl_pnl.pack(side=tk.LEFT, padx=(0,12)); e_hl_pnl.bind("<Return>", self._schedule_render); e_hl_pnl.bind("<FocusOut>", self._schedule_render)
         ttk.Label(hl_card, text="(Only rows meeting both are highlighted)", foreground="#666").pack(side=tk.LEFT, padx=(8,0))
 
         # --- Popup toggle (simple) ---
@@ -170,7 +250,9 @@ class TradesApp(tk.Tk):
         filters_card = ttk.Frame(self.left_frame, style="Card.TFrame"); filters_card.pack(fill=tk.X, padx=4, pady=(0,8))
         self.filters_frame = ttk.Frame(filters_card, style="Card.TFrame"); self.filters_frame.pack(fill=tk.X, padx=8, pady=8)
         self.dynamic_filters: Dict[str, Dict[str, Any]] = {}
-        self.skip_filter_cols = {"Time", "TimeDT"}
+        self.skip_filter_cols = set(self.SKIP_FILTER_COLS)
+        self._filter_fingerprints: Dict[str, tuple] = {}
+        self._filter_state: Optional[tuple] = None  # (df_all, firma de filtros, df_filtered resultante)
         self.build_dynamic_filters(self.df_all)
 
         # Main table
@@ -179,7 +261,8 @@ class TradesApp(tk.Tk):
         self.tree.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
         for col in self.DISPLAY_COLS:
             self.tree.heading(col, text=col, command=lambda c=col: self.sort_main_by(c))
-            self.tree.column(col, width=120, anchor="center")
+            # el ancho solo depende del nombre de la columna: se fija aquí una vez
+            self.tree.column(col, width=max(90, 9 * max(len(col), 8)), anchor="center")
         vsb = ttk.Scrollbar(self.tree, orient="vertical", command=self.tree.yview)
         self.tree.configure(yscroll=vsb.set); vsb.pack(side=tk.RIGHT, fill=tk.Y)
         self.tree.tag_configure("ROW_EVEN", background=self.PALETTE["row_even"])
@@ -307,43 +390,33 @@ class TradesApp(tk.Tk):
         # Charts a la derecha (Notebook)
         charts_nb = ttk.Notebook(right_charts); charts_nb.pack(fill=tk.BOTH, expand=True, padx=4, pady=4)
 
+        # Figure/canvas de cada chart se crean la primera vez que se pinta su pestaña (_ensure_chart):
+        # arrancar solo mirando la tabla no paga el coste de matplotlib de las pestañas no vistas
         # Cumulative PnL (abajo-derecha)
         tab_cum = ttk.Frame(charts_nb, style="Card.TFrame"); charts_nb.add(tab_cum, text="Cumulative PnL (time)")
         self.fig2 = self.ax2 = self.canvas2 = None
-        if MATPLOTLIB_OK:
-            try:
-                self.fig2 = Figure(figsize=(5,3.2), dpi=100); self.ax2 = self.fig2.add_subplot(111)
-                self.canvas2 = FigureCanvasTkAgg(self.fig2, master=tab_cum)
-                self.canvas2.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
-                self._pnl_line = None
-            except Exception: logger.exception("fig2 init failed")
+        self._pnl_line = None
 
         # Cumulative Trades (abajo-derecha)
         tab_trades = ttk.Frame(charts_nb, style="Card.TFrame"); charts_nb.add(tab_trades, text="Cumulative Trades (time)")
         self.fig3 = self.ax3 = self.canvas3 = None
-        if MATPLOTLIB_OK:
-            try:
-                self.fig3 = Figure(figsize=(5,3.2), dpi=100); self.ax3 = self.fig3.add_subplot(111)
-                self.canvas3 = FigureCanvasTkAgg(self.fig3, master=tab_trades)
-                self.canvas3.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
-                self._trades_line = None
-            except Exception: logger.exception("fig3 init failed")
-            
-            
+        self._trades_line = None
+
         # Volume over time (abajo-derecha)
         tab_vol = ttk.Frame(charts_nb, style="Card.TFrame"); charts_nb.add(tab_vol, text="Volume (time)")
         self.fig4 = self.ax4 = self.canvas4 = None
-        if MATPLOTLIB_OK:
-            try:
-                self.fig4 = Figure(figsize=(5,3.2), dpi=100); self.ax4 = self.fig4.add_subplot(111)
-                self.canvas4 = FigureCanvasTkAgg(self.fig4, master=tab_vol)
-                self.canvas4.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
-                self._vol_tsla_line = None
-                self._vol_nvda_line = None
-                self._vol_other_line = None
-            except Exception:
-                logger.exception("fig4 init failed")
-
+        self._vol_tsla_line = None
+        self._vol_nvda_line = None
+        self._vol_other_line = None
+        self._chart_tabs: Dict[int, Any] = {2: tab_cum, 3: tab_trades, 4: tab_vol}  # pendientes de crear
+
+        # Solo se repinta la pestaña visible; las demás quedan marcadas y se pintan al seleccionarlas
+        self.charts_nb = charts_nb
+        self._chart_updaters = {str(tab_cum): self.update_cumulative_pnl,
+                                str(tab_trades): self.update_trades_over_time,
+                                str(tab_vol): self.update_volume_over_time}
+        self._charts_dirty = set(self._chart_updaters)
+        charts_nb.bind("<<NotebookTabChanged>>", lambda e: self._update_charts())
 
         # Marcar UI como lista y hacer primer render
         self._ui_ready = True
@@ -452,112 +525,235 @@ class TradesApp(tk.Tk):
             self._apply_settings_to_ui(self._default_settings())
 
     # ============== App features (filters, table, charts, summaries) ==============
-    def build_dynamic_filters(self, df: pd.DataFrame):
-        prev: Dict[str, Any] = {}
-        # Guardar estado previo de los filtros para restaurar selección
-        for col, meta in self.dynamic_filters.items():
-            try:
-                if meta["type"] == "cat":
-                    sel = meta["listbox"].curselection()
-                    prev[col] = [meta["listbox"].get(i) for i in sel] if sel else ["(All)"]
-                else:
-                    prev[col] = (meta["min_var"].get(), meta["max_var"].get())
-            except Exception:
-                prev[col] = None
-
-        for w in self.filters_frame.winfo_children(): w.destroy()
-        self.dynamic_filters.clear()
-
-        cidx = 0
+    @classmethod
+    def _normalize_dtypes(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """Tipos fijos una vez por fetch, así filtros, tabla y charts leen arrays sin re-parsear:
+        TimeDT -> datetime64[s] y columnas numéricas conocidas -> numéricas (NaN si no parsea;
+        int64 -> int32 si cabe),
+        columnas de texto que son números (p. ej. CSV) -> numéricas,
+        el resto del texto filtrable -> Categorical, para filtrar por códigos."""
+        if "TimeDT" in df.columns:
+            t = df["TimeDT"]
+            if not pd.api.types.is_datetime64_any_dtype(t):
+                t = pd.to_datetime(t, errors="coerce")
+            # resolución de segundos, como la ventana de los charts: _times_s ya no convierte
+            if isinstance(t.dtype, np.dtype) and t.dtype != np.dtype("datetime64[s]"):
+                t = t.astype("datetime64[s]")
+            if t is not df["TimeDT"]:
+                df["TimeDT"] = t
+        i32 = np.iinfo(np.int32)
+        for col in cls.NUMERIC_COLS:
+            if col in df.columns and not is_numeric_dtype(df[col]):
+                df[col] = pd.to_numeric(df[col], errors="coerce")
+            # enteros de 64 bits que caben -> int32 (exactos, mitad de bytes en filtros/KPIs);
+            # los float se quedan en float64: PnL/precio se muestran y se suman
+            if col in df.columns and df[col].dtype == np.int64 and len(df):
+                v = df[col].to_numpy()
+                if i32.min < v.min() and v.max() <= i32.max:
+                    df[col] = v.astype(np.int32)
         for col in df.columns:
-            if col in {"Time","TimeDT"}:
+            if col in cls.SKIP_FILTER_COLS or isinstance(df[col].dtype, pd.CategoricalDtype):
                 continue
+            if pd.api.types.is_string_dtype(df[col]):
+                s = df[col]
+                # muestra pequeña primero para no parsear entera una columna que claramente es texto
+                head = s.dropna().iloc[:32]
+                if len(head) and pd.to_numeric(head, errors="coerce").notna().all():
+                    num = pd.to_numeric(s, errors="coerce")
+                    if num.notna().sum() == s.notna().sum():
+                        df[col] = num
+                        continue
+                df[col] = s.astype("category")
+        return df
+
+    @staticmethod
+    def _filter_fingerprint(s: pd.Series) -> tuple:
+        """Huella por columna: las numéricas solo por tipo (sus Entry no dependen de los datos),
+        las categóricas por el hash de sus valores únicos."""
+        if is_numeric_dtype(s):
+            return ("num",)
+        return ("cat", int(pd.util.hash_pandas_object(s.drop_duplicates(), index=False).sum()))
+
+    @staticmethod
+    def _filter_values(s: pd.Series) -> List[str]:
+        """Valores ordenados del Listbox; en Categorical salen de las categorías presentes (sin astype(str)).
+        Los nulos aparecen como "nan", igual que con astype(str), para poder aislar filas sin valor."""
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            codes = s.cat.codes.to_numpy()
+            missing = codes < 0
+            present = np.bincount(codes[~missing], minlength=len(s.cat.categories)) > 0
+            values = set(map(str, s.cat.categories[present]))
+            if missing.any():
+                values.add("nan")
+            return sorted(values)
+        return sorted(map(str, pd.unique(s.astype(str))))
+
+    def _repopulate_listbox(self, meta: Dict[str, Any], s: pd.Series):
+        """Rellena el Listbox de un filtro categórico conservando la selección actual. Los valores
+        elegidos que ya no están en los datos siguen en la lista y seleccionados: el filtro no se
+        pierde solo porque un refresh no los traiga (el usuario lo quita eligiendo "(All)")."""
+        lb = meta["listbox"]
+        chosen = meta["chosen"]
+        present = self._filter_values(s)
+        values = ["(All)"] + sorted(set(present).union(chosen)) if chosen else ["(All)"] + present
+        lb.delete(0, tk.END)
+        lb.insert(tk.END, *values)
+        lb.configure(height=min(6, max(1, len(values))))
+        for i in ([values.index(v) for v in chosen] or [0]):
+            lb.selection_set(i)
+        meta["values"] = values
+
+    def _on_listbox_select(self, meta: Dict[str, Any]):
+        # La selección se lee de Tcl solo aquí; apply_dynamic_filters usa meta["chosen"]
+        lb = meta["listbox"]
+        # nada elegido o solo "(All)" -> () = sin filtro
+        meta["chosen"] = tuple(v for v in (lb.get(i) for i in lb.curselection()) if v != "(All)")
+        self._debouncer.schedule("filters", self._filter_debounce_ms, self.apply_dynamic_filters)
+
+    def _create_filter(self, col: str, s: pd.Series, kind: str) -> Dict[str, Any]:
+        """Crea los widgets del filtro de una columna (Listbox si es categórica, min/max si es numérica)."""
+        colf = ttk.Frame(self.filters_frame, style="Card.TFrame")
+        ttk.Label(colf, text=str(col), font=("Segoe UI Semibold",10)).pack(anchor="w")
+
+        if kind == "cat":
+            values = ["(All)"] + self._filter_values(s)
+            lb = tk.Listbox(colf,
+                            height=min(6, max(1, len(values))),
+                            exportselection=False,
+                            selectmode="extended")
+            lb.insert(tk.END, *values)
+            lb.pack(anchor="w", fill="x", pady=(2,0))
+            lb.selection_set(0)  # "(All)"
+            meta = {"type":"cat","listbox":lb,"values":values,"chosen":(),"frame":colf}
+            # Debounce en selección
+            lb.bind("<<ListboxSelect>>", lambda e: self._on_listbox_select(meta))
+            return meta
+
+        min_var = tk.StringVar(value=""); max_var = tk.StringVar(value="")
+        row1 = ttk.Frame(colf, style="Card.TFrame"); row1.pack(anchor="w", pady=(2,0))
+        ttk.Label(row1, text="min").pack(side=tk.LEFT)
+        ttk.Entry(row1, width=8, textvariable=min_var).pack(side=tk.LEFT, padx=(4,0))
+        row2 = ttk.Frame(colf, style="Card.TFrame"); row2.pack(anchor="w", pady=(2,0))
+        ttk.Label(row2, text="max").pack(side=tk.LEFT)
+        ttk.Entry(row2, width=8, textvariable=max_var).pack(side=tk.LEFT, padx=(4,0))
+
+        # Debounce para numeric entries: un trace por variable (solo cambios reales de texto)
+        on_write = lambda *_: self._debouncer.schedule(
+            "filters", self._filter_debounce_ms, self.apply_dynamic_filters
+        )
+        traces = [(v, v.trace_add("write", on_write)) for v in (min_var, max_var)]
+        return {"type":"num","min_var":min_var,"max_var":max_var,"traces":traces,"frame":colf}
+
+    @staticmethod
+    def _destroy_filter(meta: Dict[str, Any]):
+        for var, tid in meta.get("traces", ()):
+            try: var.trace_remove("write", tid)
+            except Exception: pass
+        try: meta["frame"].destroy()
+        except Exception: pass
+
+    def build_dynamic_filters(self, df: pd.DataFrame):
+        """Sincroniza los filtros con las columnas de df. Los widgets persisten entre llamadas:
+        solo se crean/destruyen los de columnas nuevas/desaparecidas (o que cambian de tipo),
+        y solo se repueblan los Listbox cuyos valores cambiaron. La selección se conserva."""
+        fps = {col: self._filter_fingerprint(df[col]) for col in df.columns if col not in self.skip_filter_cols}
+        old_fps = self._filter_fingerprints
+        pool = self.dynamic_filters
+
+        for col in [c for c, meta in pool.items() if c not in fps or fps[c][0] != meta["type"]]:
+            self._destroy_filter(pool.pop(col))
+
+        ordered: Dict[str, Dict[str, Any]] = {}
+        for col, fp in fps.items():
             try:
-                colf = ttk.Frame(self.filters_frame, style="Card.TFrame")
-                colf.grid(row=0, column=cidx, padx=6, pady=6, sticky="nw"); cidx += 1
-                ttk.Label(colf, text=str(col), font=("Segoe UI Semibold",10)).pack(anchor="w")
-
-                if not is_numeric_dtype(df[col]):
-                    values = sorted(map(str, pd.unique(df[col].astype(str))))
-                    values = ["(All)"] + values
-                    lb = tk.Listbox(colf,
-                                    height=min(6, max(1, len(values))),
-                                    exportselection=False,
-                                    selectmode="extended")
-                    for v in values:
-                        lb.insert(tk.END, v)
-                    lb.pack(anchor="w", fill="x", pady=(2,0))
-                    # Restaurar selección previa (lista) o "(All)"
-                    to_select_list = prev.get(col, ["(All)"])
-                    try_indices = [values.index(v) for v in to_select_list if v in values]
-                    if not try_indices:
-                        try_indices = [0]
-                    lb.selection_clear(0, tk.END)
-                    for i in try_indices:
-                        lb.selection_set(i)
-                    # Debounce en selección
-                    lb.bind("<<ListboxSelect>>", lambda e: self._debouncer.schedule(
-                        "filters", self._filter_debounce_ms, self.apply_dynamic_filters
-                    ))
-                    self.dynamic_filters[col] = {"type":"cat","listbox":lb,"values":values}
-                 
-                else:
-                    min_var = tk.StringVar(value=""); max_var = tk.StringVar(value="")
-                    row1 = ttk.Frame(colf, style="Card.TFrame"); row1.pack(anchor="w", pady=(2,0))
-                    ttk.Label(row1, text="min").pack(side=tk.LEFT)
-                    e_min = ttk.Entry(row1, width=8, textvariable=min_var); e_min.pack(side=tk.LEFT, padx=(4,0))
-                    row2 = ttk.Frame(colf, style="Card.TFrame"); row2.pack(anchor="w", pady=(2,0))
-                    ttk.Label(row2, text="max").pack(side=tk.LEFT)
-                    e_max = ttk.Entry(row2, width=8, textvariable=max_var); e_max.pack(side=tk.LEFT, padx=(4,0))
-                    if col in prev and isinstance(prev[col], tuple):
-                        min_var.set(prev[col][0] or ""); max_var.set(prev[col][1] or "")
-                    
-                    # Debounce para numeric entries
-                    e_min.bind("<KeyRelease>", lambda e: self._debouncer.schedule(
-                        "filters", self._filter_debounce_ms, self.apply_dynamic_filters
-                    ))
-                    e_min.bind("<FocusOut>", lambda e: self._debouncer.schedule(
-                        "filters", self._filter_debounce_ms, self.apply_dynamic_filters
-                    ))
-                    e_max.bind("<KeyRelease>", lambda e: self._debouncer.schedule(
-                        "filters", self._filter_debounce_ms, self.apply_dynamic_filters
-                    ))
-                    e_max.bind("<FocusOut>", lambda e: self._debouncer.schedule(
-                        "filters", self._filter_debounce_ms, self.apply_dynamic_filters
-                    ))
-                    
-                    
-                    
-                    self.dynamic_filters[col] = {"type":"num","min_var":min_var,"max_var":max_var}
+                meta = pool.get(col)
+                if meta is None:
+                    meta = self._create_filter(col, df[col], fp[0])
+                elif fp[0] == "cat" and old_fps.get(col) != fp:
+                    self._repopulate_listbox(meta, df[col])
+                cidx = len(ordered)
+                if meta.get("grid_col") != cidx:
+                    meta["frame"].grid(row=0, column=cidx, padx=6, pady=6, sticky="nw")
+                    self.filters_frame.grid_columnconfigure(cidx, weight=1)
+                    meta["grid_col"] = cidx
+                ordered[col] = meta
             except Exception:
                 logger.exception("filter build failed for %s", col)
 
-        for j in range(cidx):
-            try: self.filters_frame.grid_columnconfigure(j, weight=1)
-            except Exception: pass
+        pool.clear(); pool.update(ordered)
+        self._filter_fingerprints = fps
 
     def apply_dynamic_filters(self):
         try:
-            df = self.df_all.copy()
+            # Primero solo se leen los widgets: la firma resultante decide si hay que recalcular
+            dfa = self.df_all
+            cat_conds: List[Tuple[str, Tuple[str, ...]]] = []  # (col, valores elegidos)
+            num_conds: List[Tuple[str, str, float]] = []  # (col, op, valor)
             for col, meta in self.dynamic_filters.items():
                 if meta["type"] == "cat":
-                    sel_idx = meta["listbox"].curselection()
-                    if sel_idx:
-                        chosen = [meta["listbox"].get(i) for i in sel_idx]
-                        # Si "(All)" está seleccionado o la selección queda vacía: no filtra
-                        chosen_wo_all = [v for v in chosen if v != "(All)"]
-                        if chosen_wo_all:
-                            df = df[df[col].astype(str).isin(chosen_wo_all)]
+                    # selección cacheada en el callback del Listbox (sin ida y vuelta a Tcl por tick)
+                    if meta["chosen"]:
+                        cat_conds.append((col, meta["chosen"]))
                 else:
                     smin = (meta["min_var"].get() or "").strip(); smax = (meta["max_var"].get() or "").strip()
                     vmin = safe_float(smin); vmax = safe_float(smax)
-                    if vmin is not None: df = df[df[col] >= vmin]
-                    if vmax is not None: df = df[df[col] <= vmax]
-            self.df_filtered = df.reset_index(drop=True)
+                    if vmin is not None: num_conds.append((col, ">=", vmin))
+                    if vmax is not None: num_conds.append((col, "<=", vmax))
+
+            sig = (tuple(cat_conds), tuple(num_conds))
+            st = self._filter_state
+            if st is not None and st[0] is dfa and st[1] == sig:
+                # mismos datos y mismos filtros (p. ej. selección repetida): se reutiliza el resultado
+                self.df_filtered = st[2]
+            else:
+                # Una sola máscara acumulada y un único slice al final (sin copias intermedias)
+                mask = np.ones(len(dfa), dtype=bool)
+                for col, chosen_wo_all in cat_conds:
+                    s_col = dfa[col]
+                    if isinstance(s_col.dtype, pd.CategoricalDtype):
+                        # isin sobre los códigos enteros, sin materializar strings
+                        codes = s_col.cat.categories.astype(str).get_indexer(list(chosen_wo_all))
+                        codes = codes[codes >= 0]
+                        if "nan" in chosen_wo_all:
+                            codes = np.append(codes, -1)  # nulos: código -1 (astype(str) daba "nan")
+                        mask &= np.isin(s_col.cat.codes.to_numpy(), codes)
+                    else:
+                        m = s_col.astype(str).isin(chosen_wo_all)
+                        if "nan" in chosen_wo_all:
+                            m |= s_col.isna()  # el Listbox muestra los nulos como "nan"
+                        mask &= m.to_numpy()
+                if num_conds:
+                    mask &= self._numeric_mask(dfa, num_conds)
+                self.df_filtered = dfa.loc[mask].reset_index(drop=True)
+                self._filter_state = (dfa, sig, self.df_filtered)
             self.update_all_views()
         except Exception:
             logger.exception("apply_dynamic_filters failed")
 
+    @staticmethod
+    def _numeric_mask(dfa: pd.DataFrame, conds: List[Tuple[str, str, float]]) -> np.ndarray:
+        """Todas las condiciones numéricas en una sola pasada: kernel numba por filas en frames grandes,
+        si no una expresión eval (numexpr si está instalado). Los límites van como variables locales
+        (@v0, @v1...) para que inf/nan no rompan la expresión; si algo falla (nombre de columna raro,
+        dtype object...) se cae a una máscara por columna."""
+        try:
+            if use_range_jit(len(dfa)):
+                bounds: Dict[str, List[float]] = {}
+                for col, op, v in conds:
+                    bounds.setdefault(col, [-np.inf, np.inf])[0 if op == ">=" else 1] = v
+                return range_mask([dfa[c].to_numpy() for c in bounds],
+                                  [b[0] for b in bounds.values()], [b[1] for b in bounds.values()])
+            local = {f"v{i}": v for i, (_, _, v) in enumerate(conds)}
+            expr = " & ".join(f"(`{col}` {op} @v{i})" for i, (col, op, _) in enumerate(conds))
+            return dfa.eval(expr, engine="numexpr" if NUMEXPR_OK else "python", local_dict=local).to_numpy(dtype=bool)
+        except Exception:
+            logger.debug("numeric filter eval failed; using per-column masks", exc_info=True)
+            mask = np.ones(len(dfa), dtype=bool)
+            for col, op, v in conds:
+                col_arr = dfa[col].to_numpy()
+                mask &= (col_arr >= v) if op == ">=" else (col_arr <= v)
+            return mask
+
     def clear_all_dynamic_filters(self):
         try:
             for col, meta in self.dynamic_filters.items():
@@ -569,28 +765,28 @@ class TradesApp(tk.Tk):
                             idx_all = 0
                         meta["listbox"].selection_clear(0, tk.END)
                         meta["listbox"].selection_set(idx_all)
+                    meta["chosen"] = ()
                 else:
                     meta["min_var"].set(""); meta["max_var"].set("")
-            self.df_filtered = self.df_all.copy()
+            self.df_filtered = self.df_all
             self.update_all_views()
         except Exception:
             logger.exception("clear filters failed")
 
     def update_table(self):
         try:
-            # Clear fast
-            children = self.tree.get_children()
-            if children:
-                self.tree.delete(*children)
-
             # thresholds once
-            hl_qty = safe_float(self.hl_qty.get(), default=float("inf"))
-            hl_pnl = safe_float(self.hl_pnl.get(), default=float("inf"))
+            hl_qty = self._hl_qty_f
+            hl_pnl = self._hl_pnl_f
 
             dfv = self.df_filtered  # shorthand
 
             # ---- CASO SIN DATOS ----
             if dfv.empty:
+                if self._row_iids:
+                    self.tree.delete(*self._row_iids.values())
+                    self._row_iids.clear(); self._row_shown.clear()
+
                 # KPIs PnL
                 self.kpi_total.config(text="PnL Total: 0 (0)")
                 self.kpi_pos.config(text="PnL +: +0 (0)")
@@ -605,33 +801,84 @@ class TradesApp(tk.Tk):
 
             # ---------- TABLA PRINCIPAL ----------
             cols = self.DISPLAY_COLS
-            values_rows = dfv[cols].astype(object).values.tolist()
-
-            for i, row_vals in enumerate(values_rows):
-                try:
-                    qty_v = float(row_vals[cols.index("qty")]) if "qty" in cols else 0.0
-                    pnl_v = float(row_vals[cols.index("PnL")]) if "PnL" in cols else -1e18
-                    cond_hl = (qty_v > hl_qty) and (pnl_v > hl_pnl)
-                except Exception:
-                    cond_hl = False
-                tags = ("HL",) if cond_hl else (("ROW_EVEN",) if i % 2 == 0 else ("ROW_ODD",))
-                self.tree.insert("", "end", values=row_vals, tags=tags)
-
-            for col in cols:
-                try:
-                    self.tree.column(col, width=max(90, int(9 * max(len(str(col)), 8))), anchor="center")
-                except Exception:
-                    pass
+            # _rows_cache se actualiza ya aquí y _kpi_cache al final: hasta entonces se deja invalidada,
+            # así un update interrumpido entre medias fuerza el recálculo completo de los KPIs
+            kpi_prev, self._kpi_cache = self._kpi_cache, (0, 0.0, 0, 0.0, 0, 0)
+            values_rows, n_kept = self._materialize_rows(dfv.reindex(columns=cols))
+
+            # Highlight vectorizado (código por fila, kernel numba en frames grandes) -> tag compartido
+            n = len(dfv)
+            qty_arr = dfv["qty"].to_numpy(dtype=np.float64, na_value=0.0) if "qty" in dfv.columns else np.zeros(n)
+            pnl_arr = dfv["PnL"].to_numpy(dtype=np.float64, na_value=-1e18) if "PnL" in dfv.columns else np.full(n, -1e18)
+            tag_arr = [ROW_TAGS[c] for c in row_tag_codes(qty_arr, pnl_arr, hl_qty, hl_pnl).tolist()]
+
+            # Diff contra lo ya mostrado: solo se tocan filas nuevas, borradas o cambiadas.
+            # Claves repetidas se distinguen por su número de aparición.
+            old_iids = self._row_iids
+            new_iids: Dict[tuple, Optional[str]] = {}
+            order: List[Optional[str]] = []
+            pending: List[tuple] = []  # (posición, clave, vals, tags, iid o None si hay que insertarla)
+            seen: Dict[tuple, int] = {}
+            for i, vals in enumerate(values_rows):
+                tags = (tag_arr[i],)
+                k = self._row_key(vals)
+                occ = seen.get(k, 0); seen[k] = occ + 1
+                k = (k, occ)
+                iid = old_iids.pop(k, None)
+                if iid is None or self._row_shown.get(iid) != (vals, tags):
+                    pending.append((i, k, vals, tags, iid))
+                new_iids[k] = iid
+                order.append(iid)
+
+            # Quitar las columnas durante el cambio solo compensa en cambios masivos (carga inicial,
+            # refiltrado, re-sort de muchas filas); en el tick normal son cero o pocas filas y el
+            # relayout doble (y el reset del scroll horizontal) sería puro coste
+            detached = False
+            def detach():
+                nonlocal detached
+                if not detached:
+                    self.tree.configure(displaycolumns=()); detached = True
+            try:
+                if len(pending) + len(old_iids) >= self._TREE_BULK_ROWS:
+                    detach()
+                for i, k, vals, tags, iid in pending:
+                    if iid is None:
+                        iid = self.tree.insert("", "end", values=vals, tags=tags)
+                        new_iids[k] = order[i] = iid
+                    else:
+                        self.tree.item(iid, values=vals, tags=tags)
+                    self._row_shown[iid] = (vals, tags)
+
+                if old_iids:
+                    gone = list(old_iids.values())
+                    self.tree.delete(*gone)
+                    for iid in gone:
+                        self._row_shown.pop(iid, None)
+                if list(self.tree.get_children()) != order:
+                    if len(order) >= self._TREE_BULK_ROWS:
+                        detach()
+                    self.tree.set_children("", *order)
+            finally:
+                if detached:
+                    self.tree.configure(displaycolumns=cols)
+            self._row_iids = new_iids
 
             # ---------- KPIs PnL ----------
+            # Acumulados incrementales: si las primeras n_kept filas no cambiaron, solo se suma la cola.
+            # Una pasada sobre el array: NaN no entra ni en pos ni en neg
+            k0, pos_sum, n_pos, neg_sum, n_neg, total_volume = kpi_prev
+            if n_kept == 0 or k0 != n_kept:
+                k0, pos_sum, n_pos, neg_sum, n_neg, total_volume = 0, 0.0, 0, 0.0, 0, 0
+            tail = dfv.iloc[k0:] if k0 else dfv
             if "PnL" in dfv.columns:
-                pnl = dfv["PnL"]
-                total = float(pnl.sum()); n_total = int(len(dfv))
-                pos_mask = pnl > 0; neg_mask = pnl < 0
-                pos_sum = float(pnl.loc[pos_mask].sum()); n_pos = int(pos_mask.sum())
-                neg_sum = float(pnl.loc[neg_mask].sum()); n_neg = int(neg_mask.sum())
-            else:
-                total = pos_sum = neg_sum = 0.0; n_total = n_pos = n_neg = 0
+                pnl = tail["PnL"].to_numpy(dtype=np.float64, na_value=np.nan)
+                pos = pnl[pnl > 0]; neg = pnl[pnl < 0]
+                pos_sum += float(pos.sum()); n_pos += int(pos.size)
+                neg_sum += float(neg.sum()); n_neg += int(neg.size)
+            if "qty" in dfv.columns:
+                total_volume += tail["qty"].abs().sum()
+            self._kpi_cache = (len(dfv), pos_sum, n_pos, neg_sum, n_neg, total_volume)
+            total = pos_sum + neg_sum; n_total = int(len(dfv))
 
             sign = "+" if total > 0 else ("−" if total < 0 else "")
             self.kpi_total.config(text=f"PnL Total: {sign}{abs(total):,.0f} ({n_total})")
@@ -644,7 +891,7 @@ class TradesApp(tk.Tk):
 
             if "qty" in dfv.columns:
                 self.kpi_total_volume.config(
-                    text=f"Total Volume: {dfv['qty'].abs().sum():,}"
+                    text=f"Total Volume: {total_volume:,}"
                 )
             else:
                 self.kpi_total_volume.config(text="Total Volume: 0")
@@ -653,8 +900,10 @@ class TradesApp(tk.Tk):
             par = dfv  # placeholder
             self.kpi_parchen_trades.config(text=f"Parchen Trades: {len(par)}")
             if "qty" in par.columns:
+                # mientras par sea dfv, el volumen ya está calculado
+                par_volume = total_volume if par is dfv else par["qty"].abs().sum()
                 self.kpi_parchen_volume.config(
-                    text=f"Parchen Volume: {par['qty'].abs().sum():,}"
+                    text=f"Parchen Volume: {par_volume:,}"
                 )
             else:
                 self.kpi_parchen_volume.config(text="Parchen Volume: 0")
@@ -665,6 +914,21 @@ class TradesApp(tk.Tk):
 
 
 
+    def _materialize_rows(self, dv: pd.DataFrame) -> Tuple[List[tuple], int]:
+        """Filas de dv como tuplas de Python. Si las primeras k filas son las de la última vez
+        (mismo hash por fila, calculado en C), solo se convierte la cola: los refresh que
+        añaden trades al final cuestan O(Δ) en objetos Python en vez de O(N).
+        Devuelve (filas, k) con k = filas reutilizadas (0 si se rematerializó todo)."""
+        h = pd.util.hash_pandas_object(dv, index=False).to_numpy()
+        prev_h, prev_rows = self._rows_cache
+        k = len(prev_h)
+        if 0 < k <= len(h) and np.array_equal(h[:k], prev_h):
+            rows = prev_rows + list(dv.iloc[k:].itertuples(index=False, name=None)) if k < len(h) else prev_rows
+        else:
+            rows = list(dv.itertuples(index=False, name=None)); k = 0
+        self._rows_cache = (h, rows)
+        return rows, k
+
     # ---- BIS accessor (para uso futuro en lógica/funciones) ----
     def get_bis(self) -> str:
         """Devuelve el valor actual de BIS (string). Realiza strip()."""
@@ -689,7 +953,7 @@ class TradesApp(tk.Tk):
 
 
     def update_cumulative_pnl(self):
-        if not (MATPLOTLIB_OK and self.ax2 and self.canvas2):
+        if not self._ensure_chart(2):
             return
         try:
     
@@ -699,7 +963,7 @@ class TradesApp(tk.Tk):
                 self.ax2.set_xlabel("Time")
                 self.ax2.set_ylabel("PnL cumulative (€)")
                 self.ax2.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M"))
-                self.ax2.xaxis.set_major_locator(mdates.HourLocator(byhour=[8,10,12,14,16,18,20,22]))
+                self.ax2.xaxis.set_major_locator(mdates.HourLocator(byhour=_CHART_HOURS))
                 self.ax2.grid(True, axis="y", alpha=0.2)
                 self._ax2_inited = True
     
@@ -715,11 +979,8 @@ class TradesApp(tk.Tk):
                 self.canvas2.draw_idle()
                 return
     
-            df = self.df_filtered.copy()
-            df["TimeDT"] = pd.to_datetime(df["TimeDT"], errors="coerce")
-            df["PnL"] = pd.to_numeric(df["PnL"], errors="coerce").fillna(0.0)
-            df = df.dropna(subset=["TimeDT"]).sort_values("TimeDT")
-            if df.empty:
+            win = self._chart_window()
+            if win is None:
                 today = pd.Timestamp.today().normalize()
                 start, end = self._day_window_bounds(today)
                 self.ax2.set_xlim(start, end)
@@ -728,39 +989,36 @@ class TradesApp(tk.Tk):
                 self._pnl_line.set_data([], [])
                 self.canvas2.draw_idle()
                 return
-    
-            # Window 08–22 of the day of first trade
-            start_day, end_day = self._day_window_bounds(df["TimeDT"].iloc[0])
-            df = df[(df["TimeDT"] >= start_day) & (df["TimeDT"] <= end_day)]
-            if df.empty:
+
+            start_day, end_day, lo, hi = win
+            if lo >= hi:
                 self.ax2.set_xlim(start_day, end_day)
                 if self._pnl_line is None:
                     (self._pnl_line,) = self.ax2.plot([], [], linewidth=2, drawstyle="steps-post")
                 self._pnl_line.set_data([], [])
                 self.canvas2.draw_idle()
                 return
-    
-            # 1s grouping via resample
-            s = (df.set_index("TimeDT")["PnL"]
-                    .resample("1s", origin="start_day").sum()
-                    .sort_index())
-    
-            # Reindex strictly between first & last second with data
-            first_sec, last_sec = s.index[0], s.index[-1]
-            sec_index = pd.date_range(first_sec, last_sec, freq="1s")
-            s = s.reindex(sec_index, fill_value=0.0)
-    
+
+            # cumsum lineal y último valor de cada segundo (1s grouped); con steps-post
+            # los segundos sin trades no hace falta rellenarlos
+            ts = self._chart_cache
+            pnls = self.df_filtered["PnL"].to_numpy(dtype=np.float64, na_value=0.0)
+            t_win = ts["t_sorted"][lo:hi]
+            cum = np.cumsum(pnls[ts["order"][lo:hi]])
+            last = np.flatnonzero(np.r_[t_win[1:] != t_win[:-1], True])
+            x, y = t_win[last], cum[last]
+            keep = m4_indices(x, y, self._pixel_width(self.ax2))
+            x, y = x[keep], y[keep]
+
             # cumulative series (no clears; reuse the line)
-            cum = s.cumsum()
             if self._pnl_line is None:
-                (self._pnl_line,) = self.ax2.plot(cum.index, cum.values, linewidth=2, drawstyle="steps-post")
+                (self._pnl_line,) = self.ax2.plot(x, y, linewidth=2, drawstyle="steps-post")
             else:
-                self._pnl_line.set_data(cum.index, cum.values)
+                self._pnl_line.set_data(x, y)
     
             # Keep x axis fixed 08–22, line only spans [first_sec, last_sec]
             self.ax2.set_xlim(start_day, end_day)
-            self.fig2.tight_layout()
-            self.canvas2.draw_idle()
+            self._blit_or_draw(self.ax2)
     
         except Exception:
             # trimmed logging on hot path
@@ -768,7 +1026,7 @@ class TradesApp(tk.Tk):
                 logger.exception("update_cumulative_pnl failed")
 
     def update_volume_over_time(self):
-        if not (MATPLOTLIB_OK and self.ax4 and self.canvas4):
+        if not self._ensure_chart(4):
             return
         try:
 
@@ -778,8 +1036,9 @@ class TradesApp(tk.Tk):
                 self.ax4.set_xlabel("Time")
                 self.ax4.set_ylabel("Cumulative volume (|qty| * price)")
                 self.ax4.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M"))
-                self.ax4.xaxis.set_major_locator(mdates.HourLocator(byhour=[8,10,12,14,16,18,20,22]))
+                self.ax4.xaxis.set_major_locator(mdates.HourLocator(byhour=_CHART_HOURS))
                 self.ax4.grid(True, axis="y", alpha=0.2)
+                self.ax4.yaxis.set_major_formatter(FuncFormatter(_fmt_vol))
                 self._ax4_inited = True
 
             needed = {"TimeDT", "qty", "exec price", "nombre"}
@@ -787,117 +1046,60 @@ class TradesApp(tk.Tk):
                 today = pd.Timestamp.today().normalize()
                 start, end = self._day_window_bounds(today)
                 self.ax4.set_xlim(start, end)
-                if self._vol_tsla_line is None:
-                    (self._vol_tsla_line,) = self.ax4.plot([], [], linewidth=2, label="TSLA")
-                    (self._vol_nvda_line,) = self.ax4.plot([], [], linewidth=2, label="NVDA")
-                    (self._vol_other_line,) = self.ax4.plot([], [], linewidth=2, label="Other")
-                    self.ax4.legend(loc="upper left")
-                else:
-                    self._vol_tsla_line.set_data([], [])
-                    self._vol_nvda_line.set_data([], [])
-                    self._vol_other_line.set_data([], [])
+                self._set_vol_lines([], ([], [], []))
                 self.canvas4.draw_idle()
                 return
 
-            df = self.df_filtered.copy()
-            df["TimeDT"] = pd.to_datetime(df["TimeDT"], errors="coerce")
-            df["qty"] = pd.to_numeric(df["qty"], errors="coerce")
-            df["exec price"] = pd.to_numeric(df["exec price"], errors="coerce")
-            df = df.dropna(subset=["TimeDT", "qty", "exec price"])
-            if df.empty:
+            dfv = self.df_filtered
+            ts = self._prep_timeseries()
+            times = ts["times"]
+            qty = dfv["qty"].to_numpy(dtype=np.float64, na_value=np.nan)
+            price = dfv["exec price"].to_numpy(dtype=np.float64, na_value=np.nan)
+            valid = ~np.isnat(times) & ~np.isnan(qty) & ~np.isnan(price)
+            if not valid.any():
                 today = pd.Timestamp.today().normalize()
                 start, end = self._day_window_bounds(today)
                 self.ax4.set_xlim(start, end)
-                if self._vol_tsla_line is None:
-                    (self._vol_tsla_line,) = self.ax4.plot([], [], linewidth=2, label="TSLA")
-                    (self._vol_nvda_line,) = self.ax4.plot([], [], linewidth=2, label="NVDA")
-                    (self._vol_other_line,) = self.ax4.plot([], [], linewidth=2, label="Other")
-                    self.ax4.legend(loc="upper left")
-                else:
-                    self._vol_tsla_line.set_data([], [])
-                    self._vol_nvda_line.set_data([], [])
-                    self._vol_other_line.set_data([], [])
+                self._set_vol_lines([], ([], [], []))
                 self.canvas4.draw_idle()
                 return
 
-            # limitar a la ventana 08–22 del día del primer trade
-            start_day, end_day = self._day_window_bounds(df["TimeDT"].iloc[0])
-            df = df[(df["TimeDT"] >= start_day) & (df["TimeDT"] <= end_day)]
-            if df.empty:
+            # limitar a la ventana 08–22 del día del primer trade (primera fila válida, en el orden del frame)
+            start_day, end_day = self._day_window_bounds(pd.Timestamp(times[int(np.argmax(valid))]))
+            valid &= (times >= start_day.to_datetime64()) & (times <= end_day.to_datetime64())
+            if not valid.any():
                 self.ax4.set_xlim(start_day, end_day)
-                if self._vol_tsla_line is None:
-                    (self._vol_tsla_line,) = self.ax4.plot([], [], linewidth=2, label="TSLA")
-                    (self._vol_nvda_line,) = self.ax4.plot([], [], linewidth=2, label="NVDA")
-                    (self._vol_other_line,) = self.ax4.plot([], [], linewidth=2, label="Other")
-                    self.ax4.legend(loc="upper left")
-                else:
-                    self._vol_tsla_line.set_data([], [])
-                    self._vol_nvda_line.set_data([], [])
-                    self._vol_other_line.set_data([], [])
+                self._set_vol_lines([], ([], [], []))
                 self.canvas4.draw_idle()
                 return
 
             # volumen = |qty| * price
-            df["vol"] = df["exec price"].abs() * df["qty"].abs()
-
-            # bucket: TSLA, NVDA, Other (por nombre)
-            names = df["nombre"].astype(str).str.upper()
-            df["bucket"] = "Other"
-            df.loc[names == "TSLA", "bucket"] = "TSLA"
-            df.loc[names == "NVDA", "bucket"] = "NVDA"
-
-            # resample 1s por bucket (volumen por segundo)
-            s = (df.set_index("TimeDT")
-                    .groupby("bucket")["vol"]
-                    .resample("1s", origin="start_day")
-                    .sum()
-                    .unstack("bucket")
-                    .sort_index())
-
-            # asegurar columnas TSLA, NVDA, Other
-            for col in ["TSLA", "NVDA", "Other"]:
-                if col not in s.columns:
-                    s[col] = 0.0
-            s = s[["TSLA", "NVDA", "Other"]]
-
-            # reindex continuo y rellenar
-            first_sec, last_sec = s.index[0], s.index[-1]
-            idx = pd.date_range(first_sec, last_sec, freq="1s")
-            s = s.reindex(idx, fill_value=0.0)
-
-            # 🔹 HACERLO ACUMULADO
-            s_cum = s.cumsum()
-
-            if self._vol_tsla_line is None:
-                (self._vol_tsla_line,) = self.ax4.plot(
-                    s_cum.index, s_cum["TSLA"].values,
-                    linewidth=2, drawstyle="steps-post", label="TSLA"
-                )
-                (self._vol_nvda_line,) = self.ax4.plot(
-                    s_cum.index, s_cum["NVDA"].values,
-                    linewidth=2, drawstyle="steps-post", label="NVDA"
-                )
-                (self._vol_other_line,) = self.ax4.plot(
-                    s_cum.index, s_cum["Other"].values,
-                    linewidth=2, drawstyle="steps-post", label="Other"
-                )
-                self.ax4.legend(loc="upper left")
+            vol = np.abs(price) * np.abs(qty)
+
+            # bucket: 0=TSLA, 1=NVDA, 2=Other (por nombre; en Categorical se decide por categoría)
+            names = dfv["nombre"]
+            if isinstance(names.dtype, pd.CategoricalDtype):
+                up = names.cat.categories.astype(str).str.upper()
+                by_cat = np.append(np.where(up == "TSLA", 0, np.where(up == "NVDA", 1, 2)), 2)  # código -1 -> Other
+                bucket = by_cat[names.cat.codes.to_numpy()]
             else:
-                self._vol_tsla_line.set_data(s_cum.index, s_cum["TSLA"].values)
-                self._vol_nvda_line.set_data(s_cum.index, s_cum["NVDA"].values)
-                self._vol_other_line.set_data(s_cum.index, s_cum["Other"].values)
+                up = names.astype(str).str.upper().to_numpy()
+                bucket = np.where(up == "TSLA", 0, np.where(up == "NVDA", 1, 2))
+
+            # orden temporal y suma por segundo con reduceat sobre los inicios de cada segundo
+            idx = ts["order"][valid[ts["order"]]]  # orden temporal ya calculado, solo filas válidas
+            secs = times[idx]
+            starts = np.flatnonzero(np.r_[True, secs[1:] != secs[:-1]])
+            x = secs[starts]
+            vol_s = vol[idx]; bucket_s = bucket[idx]
+            # acumulado por bucket; con steps-post no hace falta rellenar los segundos sin trades
+            y_tsla, y_nvda, y_other = (np.cumsum(np.add.reduceat(np.where(bucket_s == b, vol_s, 0.0), starts))
+                                       for b in (0, 1, 2))
+
+            self._set_vol_lines(x, (y_tsla, y_nvda, y_other))
 
             self.ax4.set_xlim(start_day, end_day)
-            from matplotlib.ticker import FuncFormatter
-            def _fmt_vol(y, pos):
-                if abs(y) >= 1_000_000:
-                    return f"{y/1_000_000:.1f}M"
-                return f"{y:,.0f}"
-            
-            
-            self.ax4.yaxis.set_major_formatter(FuncFormatter(_fmt_vol))
-            self.fig4.tight_layout()
-            self.canvas4.draw_idle()
+            self._blit_or_draw(self.ax4)
 
         except Exception:
             if logger.isEnabledFor(logging.DEBUG):
@@ -906,15 +1108,106 @@ class TradesApp(tk.Tk):
 
 
 
+    def _set_vol_lines(self, x, ys) -> None:
+        """Crea (una vez) o actualiza las tres líneas TSLA/NVDA/Other. Siempre steps-post: la serie
+        solo tiene los segundos con trades y el escalón es lo que la hace equivalente a la rejilla densa."""
+        if self._vol_tsla_line is None:
+            self._vol_tsla_line, self._vol_nvda_line, self._vol_other_line = (
+                self.ax4.plot(x, y, linewidth=2, drawstyle="steps-post", label=label)[0]
+                for y, label in zip(ys, ("TSLA", "NVDA", "Other")))
+            self.ax4.legend(loc="upper left")
+        else:
+            for line, y in zip((self._vol_tsla_line, self._vol_nvda_line, self._vol_other_line), ys):
+                line.set_data(x, y)
+
+    def _chart_lines(self, ax) -> list:
+        if ax is self.ax2: lines = [self._pnl_line]
+        elif ax is self.ax3: lines = [self._trades_line]
+        elif ax is self.ax4: lines = [self._vol_tsla_line, self._vol_nvda_line, self._vol_other_line]
+        else: lines = []
+        return [l for l in lines if l is not None]
+
+    def _on_chart_draw(self, ax):
+        """draw_event: guarda el fondo (ejes, grid, leyenda; las líneas son 'animated') y pinta las líneas encima."""
+        try:
+            canvas = ax.figure.canvas
+            self._blit_bg[ax] = ((ax.get_xlim(), ax.get_ylim()), canvas.copy_from_bbox(ax.bbox))
+            for line in self._chart_lines(ax):
+                ax.draw_artist(line)
+        except Exception:
+            self._blit_bg.pop(ax, None)
+            logger.debug("chart background capture failed", exc_info=True)
+
+    def _blit_or_draw(self, ax):
+        """Con fondo cacheado para los mismos límites solo se repintan las líneas (blit);
+        si no, redibujo completo (tight_layout incluido), que vuelve a capturar el fondo."""
+        lines = self._chart_lines(ax)
+        fresh = [l for l in lines if not l.get_animated()]
+        for line in fresh:
+            line.set_animated(True)
+        bg = self._blit_bg.get(ax)
+        canvas = ax.figure.canvas
+        if bg is not None and not fresh and bg[0] == (ax.get_xlim(), ax.get_ylim()):
+            canvas.restore_region(bg[1])
+            for line in lines:
+                ax.draw_artist(line)
+            canvas.blit(ax.bbox)
+        else:
+            ax.figure.tight_layout()
+            canvas.draw_idle()
+
+    @staticmethod
+    def _pixel_width(ax) -> int:
+        """Ancho del área de ejes en píxeles: resolución a la que se decima la serie antes de set_data."""
+        try:
+            return max(1, int(ax.bbox.width))
+        except Exception:
+            return 1000
+
+    def _prep_timeseries(self) -> Dict[str, Any]:
+        """TimeDT de df_filtered como datetime64[s] más su argsort estable (NaT al final).
+        Se calcula una vez por frame (comparando identidad, no id()) y lo comparten los charts."""
+        dfv = self.df_filtered
+        c = self._chart_cache
+        if c.get("df") is not dfv:
+            times = self._times_s(dfv["TimeDT"])
+            order = np.argsort(times, kind="stable")
+            t_sorted = times[order]
+            c.clear()
+            c.update(df=dfv, times=times, order=order, t_sorted=t_sorted,
+                     n_valid=int(t_sorted.shape[0] - np.isnat(t_sorted).sum()))
+        return c
+
+    def _chart_window(self) -> Optional[tuple]:
+        """(start_day, end_day, lo, hi): ventana 08–22 del día del primer trade como rango [lo, hi)
+        sobre t_sorted. Se calcula una vez por frame; PnL y trades acumulados la comparten.
+        None si no hay tiempos válidos."""
+        c = self._prep_timeseries()
+        if "window" not in c:
+            n_valid = c["n_valid"]
+            if n_valid == 0:
+                c["window"] = None
+            else:
+                t = c["t_sorted"][:n_valid]  # ya ordenado: dos searchsorted
+                start_day, end_day = self._day_window_bounds(pd.Timestamp(t[0]))
+                c["window"] = (start_day, end_day,
+                               int(np.searchsorted(t, start_day.to_datetime64(), side="left")),
+                               int(np.searchsorted(t, end_day.to_datetime64(), side="right")))
+        return c["window"]
+
+    @staticmethod
+    def _times_s(s: pd.Series) -> np.ndarray:
+        """Columna de tiempos como datetime64[s] (NaT si no parsea), sin copiar el DataFrame."""
+        if not pd.api.types.is_datetime64_any_dtype(s):
+            s = pd.to_datetime(s, errors="coerce")
+        return s.to_numpy(dtype="datetime64[s]")
+
     def _day_window_bounds(self, ts: pd.Timestamp) -> tuple[pd.Timestamp, pd.Timestamp]:
-        day = ts.normalize()
-        start = day.replace(hour=8, minute=0, second=0, microsecond=0)
-        end   = day.replace(hour=22, minute=0, second=0, microsecond=0)
-        return start, end
+        return _day_bounds(ts.year, ts.month, ts.day)
 
 
     def update_trades_over_time(self):
-        if not (MATPLOTLIB_OK and self.ax3 and self.canvas3):
+        if not self._ensure_chart(3):
             return
         try:
     
@@ -924,7 +1217,7 @@ class TradesApp(tk.Tk):
                 self.ax3.set_xlabel("Time")
                 self.ax3.set_ylabel("Trades (cum)")
                 self.ax3.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M"))
-                self.ax3.xaxis.set_major_locator(mdates.HourLocator(byhour=[8,10,12,14,16,18,20,22]))
+                self.ax3.xaxis.set_major_locator(mdates.HourLocator(byhour=_CHART_HOURS))
                 self.ax3.grid(True, axis="y", alpha=0.2)
                 self._ax3_inited = True
     
@@ -938,10 +1231,8 @@ class TradesApp(tk.Tk):
                 self.canvas3.draw_idle()
                 return
     
-            df = self.df_filtered.copy()
-            df["TimeDT"] = pd.to_datetime(df["TimeDT"], errors="coerce")
-            df = df.dropna(subset=["TimeDT"]).sort_values("TimeDT")
-            if df.empty:
+            win = self._chart_window()
+            if win is None:
                 today = pd.Timestamp.today().normalize()
                 start, end = self._day_window_bounds(today)
                 self.ax3.set_xlim(start, end)
@@ -951,9 +1242,9 @@ class TradesApp(tk.Tk):
                 self.canvas3.draw_idle()
                 return
     
-            start_day, end_day = self._day_window_bounds(df["TimeDT"].iloc[0])
-            df = df[(df["TimeDT"] >= start_day) & (df["TimeDT"] <= end_day)]
-            if df.empty:
+            start_day, end_day, lo, hi = win
+            times = self._chart_cache["t_sorted"][lo:hi]
+            if times.size == 0:
                 self.ax3.set_xlim(start_day, end_day)
                 if self._trades_line is None:
                     (self._trades_line,) = self.ax3.plot([], [], linewidth=2, drawstyle="steps-post")
@@ -961,23 +1252,21 @@ class TradesApp(tk.Tk):
                 self.canvas3.draw_idle()
                 return
     
-            # 1s counts, then cumulative
-            counts = (df.set_index(df["TimeDT"].dt.floor("s"))
-                        .sort_index()
-                        .groupby(level=0)["TimeDT"].size())
-            first_sec, last_sec = counts.index[0], counts.index[-1]
-            sec_index = pd.date_range(first_sec, last_sec, freq="1s")
-            counts = counts.reindex(sec_index, fill_value=0)
-            cum = counts.cumsum()
+            # 1s counts (bins de 1 s sobre segundos epoch), then cumulative
+            secs = times.astype(np.int64)
+            first_sec, last_sec = int(secs[0]), int(secs[-1])
+            cum = cum_bin_counts(secs, first_sec, 1.0, last_sec - first_sec + 1)
+            sec_index = np.datetime64(first_sec, "s") + np.arange(cum.shape[0])  # eje x sin DatetimeIndex
+            keep = m4_indices(sec_index, cum, self._pixel_width(self.ax3))
+            sec_index, cum = sec_index[keep], cum[keep]
     
             if self._trades_line is None:
-                (self._trades_line,) = self.ax3.plot(cum.index, cum.values, linewidth=2, drawstyle="steps-post")
+                (self._trades_line,) = self.ax3.plot(sec_index, cum, linewidth=2, drawstyle="steps-post")
             else:
-                self._trades_line.set_data(cum.index, cum.values)
+                self._trades_line.set_data(sec_index, cum)
     
             self.ax3.set_xlim(start_day, end_day)
-            self.fig3.tight_layout()
-            self.canvas3.draw_idle()
+            self._blit_or_draw(self.ax3)
     
         except Exception:
             if logger.isEnabledFor(logging.DEBUG):
@@ -991,59 +1280,74 @@ class TradesApp(tk.Tk):
     # ---- Global summaries (UNFILTERED) ----
     def update_global_summaries(self):
         try:
+            # Los resúmenes dependen solo de df_all: si el fetch trajo las mismas filas, no se recalculan
+            dfa = self.df_all
+            sig = (len(dfa), int(pd.util.hash_pandas_object(dfa, index=False).to_numpy().sum()))
+            if sig == self._summary_sig:
+                return
             def make_summary(df: pd.DataFrame, keycol: str) -> pd.DataFrame:
                 if df.empty:
                     return pd.DataFrame(columns=[keycol,"trades","pos_trades","neg_trades","pct_pos","dt_mean","pnl_mean","pnl_total","pnl_pos","pnl_neg"])
-                g = df.groupby(keycol).agg(
+                # Columnas derivadas una vez y solo reductores nativos (sin lambdas por grupo)
+                pnl = df["PnL"]
+                pos = pnl.gt(0); neg = pnl.lt(0)
+                work = pd.DataFrame({
+                    keycol: df[keycol], "PnL": pnl, "inc_t_s": df["inc_t_s"],
+                    "_pos": pos, "_neg": neg,
+                    "_pnl_pos": pnl.where(pos, 0.0), "_pnl_neg": pnl.where(neg, 0.0),
+                })
+                g = work.groupby(keycol, observed=True).agg(
                     trades=("PnL","size"),
-                    pos_trades=("PnL", lambda s: int((s>0).sum())),
-                    neg_trades=("PnL", lambda s: int((s<0).sum())),
-                    pct_pos=("PnL", lambda s: 100.0 * (s.gt(0).sum()) / max(1, len(s))),
+                    pos_trades=("_pos","sum"),
+                    neg_trades=("_neg","sum"),
                     dt_mean=("inc_t_s","mean"),
                     pnl_mean=("PnL","mean"),
                     pnl_total=("PnL","sum"),
-                    pnl_pos=("PnL", lambda s: float(s[s>0].sum())),
-                    pnl_neg=("PnL", lambda s: float(s[s<0].sum())),
-                ).reset_index().sort_values("pnl_total", ascending=False)
-                return g
+                    pnl_pos=("_pnl_pos","sum"),
+                    pnl_neg=("_pnl_neg","sum"),
+                )
+                g.insert(3, "pct_pos", 100.0 * g["pos_trades"] / g["trades"].clip(lower=1))
+                return g.reset_index().sort_values("pnl_total", ascending=False)
 
             g_ex   = make_summary(self.df_all, "Exchange")
             g_isin = make_summary(self.df_all, "ISIN").head(50)
             g_nom  = make_summary(self.df_all, "nombre")
 
             def rows_from_df(df: pd.DataFrame, keyname: str) -> List[List[Any]]:
+                # Columnas a listas de Python una vez; todo el texto se formatea por columna
+                # y el bucle por fila solo ensambla los dicts "rich" ya formateados
+                keys = df[keyname].tolist()
+                trades = [str(v) for v in df["trades"].to_numpy(dtype=np.int64).tolist()]
+                pos_tr = [f"+{v}" for v in df["pos_trades"].to_numpy(dtype=np.int64).tolist()]
+                neg_tr = ["0" if v == 0 else f"−{v}" for v in df["neg_trades"].to_numpy(dtype=np.int64).tolist()]  # no '−0'
+                pct_txt = [f"{v:.1f}%" for v in df["pct_pos"].to_numpy(dtype=np.float64).tolist()]
+                dt_txt = [f"{v:.1f}" for v in df["dt_mean"].to_numpy(dtype=np.float64).tolist()]
+                mean_txt = [f"{v:.1f}" for v in df["pnl_mean"].to_numpy(dtype=np.float64).tolist()]
+                tot_txt = [signed_text(v) for v in df["pnl_total"].to_numpy(dtype=np.float64).tolist()]
+                pos_txt = [f"+{v:.0f}" for v in df["pnl_pos"].to_numpy(dtype=np.float64).tolist()]
+                neg_txt = ["0" if v == 0 else f"−{abs(v):.0f}" for v in df["pnl_neg"].to_numpy(dtype=np.float64).tolist()]
+
                 rows: List[List[Any]] = []
-                for _, r in df.iterrows():
-                    neg_tr = int(r["neg_trades"])
-                    neg_txt = "0" if neg_tr == 0 else f"−{neg_tr}"  # no '−0'
+                for key, t, p, ng, pct, dt, mean, tot, ppos, pneg in zip(
+                        keys, trades, pos_tr, neg_tr, pct_txt, dt_txt, mean_txt, tot_txt, pos_txt, neg_txt):
                     trip_trades = {"rich":[
-                        (f"{int(r['trades'])}","blue"), (" | ","muted"),
-                        (f"+{int(r['pos_trades'])}","green"), (" | ","muted"),
-                        (neg_txt,"red"),
+                        (t,"blue"), _SEP_MUTED,
+                        (p,"green"), _SEP_MUTED,
+                        (ng,"red"),
                     ]}
-                    pnl_total_txt = signed_text(float(r["pnl_total"]))
-                    pnl_pos_txt   = f"+{float(r['pnl_pos']):.0f}"
-                    pnl_neg_val   = float(r["pnl_neg"])
-                    pnl_neg_txt   = "0" if pnl_neg_val == 0 else f"−{abs(pnl_neg_val):.0f}"
                     trip_pnl = {"rich":[
-                        (pnl_total_txt,"blue"), (" | ","muted"),
-                        (pnl_pos_txt,"green"),  (" | ","muted"),
-                        (pnl_neg_txt,"red"),
+                        (tot,"blue"), _SEP_MUTED,
+                        (ppos,"green"), _SEP_MUTED,
+                        (pneg,"red"),
                     ]}
-                    rows.append([
-                        r[keyname],
-                        trip_trades,
-                        f"{float(r['pct_pos']):.1f}%",
-                        f"{float(r['dt_mean']):.1f}",
-                        f"{float(r['pnl_mean']):.1f}",
-                        trip_pnl,
-                    ])
+                    rows.append([key, trip_trades, pct, dt, mean, trip_pnl])
                 return rows
 
             self.exch_table.set_rows(rows_from_df(g_ex, "Exchange"))
             self.isin_table.set_rows(rows_from_df(g_isin, "ISIN"))
             self.nombre_table.set_rows(rows_from_df(g_nom, "nombre"))
             self.cp_table.update_from_df(self.df_all)
+            self._summary_sig = sig
             
             #self.cp_table = CounterpartyVolumeTable(
             #    tab_cp,
@@ -1065,62 +1369,150 @@ class TradesApp(tk.Tk):
         try:
             asc = not self.sort_state_main.get(col, True)
             self.sort_state_main[col] = asc
-            df = self.df_filtered.copy()
-            if col in ("qty","PnL","exec price","inc_t_s"):
-                df = df.sort_values(by=col, ascending=asc, kind="mergesort")
-            elif col == "Time":
-                df = df.sort_values(by="TimeDT", ascending=asc, kind="mergesort")
-            else:
-                df = df.sort_values(by=col, ascending=asc, kind="mergesort")
+            # estable para todas las columnas: con empates (qty, b/s, ...) las filas no saltan entre
+            # clics y el diff del Treeview no tiene que mover filas que no cambiaron de sitio relativo
+            by = "TimeDT" if col == "Time" else col
+            df = self.df_filtered.sort_values(by=by, ascending=asc, kind="stable")
             self.df_filtered = df.reset_index(drop=True)
             self.update_all_views()
         except Exception:
             logger.exception("sort_main_by failed for %s", col)
 
+    def _view_signature(self) -> Optional[tuple]:
+        """Firma barata de lo que pintan tabla y charts: contenido + orden de df_filtered y umbrales."""
+        try:
+            dfv = self.df_filtered
+            # index=True: el hash de cada fila incluye su posición (RangeIndex) -> sensible al orden
+            h = pd.util.hash_pandas_object(dfv.reindex(columns=self.DISPLAY_COLS + ["TimeDT"]), index=True)
+            return (len(dfv), int(h.to_numpy().sum()), self._hl_qty_f, self._hl_pnl_f)
+        except Exception:
+            logger.debug("view signature failed", exc_info=True)
+            return None
+
+    def _update_hl_thresholds(self, *_):
+        self._hl_qty_f = safe_float(self.hl_qty.get(), default=float("inf"))
+        self._hl_pnl_f = safe_float(self.hl_pnl.get(), default=float("inf"))
+
+    def _schedule_render(self, *_):
+        # Return + FocusOut (o saltar entre los dos Entry) -> un único update_all_views
+        self._debouncer.schedule("render", self._filter_debounce_ms, self.update_all_views)
+
     def update_all_views(self):
-        self.update_table(); 
-        self.update_cumulative_pnl(); 
-        self.update_trades_over_time()
-        self.update_volume_over_time()
+        # refresh idénticos (mismas filas, mismo orden, mismos umbrales): nada que repintar
+        sig = self._view_signature()
+        if sig is not None and sig == self._last_view_sig:
+            return
+        self._last_view_sig = sig
+        self.update_table()
+        self._charts_dirty.update(self._chart_updaters)
+        self._update_charts()
+
+    def _ensure_chart(self, n: int) -> bool:
+        """Crea fig/ax/canvas del chart n (2, 3 o 4) en su pestaña si aún no existen. Se intenta una vez."""
+        if getattr(self, f"canvas{n}") is not None:
+            return True
+        tab = self._chart_tabs.pop(n, None)
+        if not MATPLOTLIB_OK or tab is None:
+            return False
+        try:
+            fig = Figure(figsize=(5,3.2), dpi=100); ax = fig.add_subplot(111)
+            canvas = FigureCanvasTkAgg(fig, master=tab)
+            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
+            canvas.mpl_connect("draw_event", lambda e: self._on_chart_draw(ax))
+            # el decimado (m4_indices) depende del ancho en píxeles: al redimensionar se recalcula la serie
+            canvas.mpl_connect("resize_event", lambda e, key=str(tab): self._debouncer.schedule(
+                f"resize:{key}", self._filter_debounce_ms, self._on_chart_resize, key))
+            setattr(self, f"fig{n}", fig); setattr(self, f"ax{n}", ax); setattr(self, f"canvas{n}", canvas)
+            return True
+        except Exception:
+            logger.exception("fig%d init failed", n)
+            return False
+
+    def _on_chart_resize(self, key: str):
+        """Tras un resize el chart se marca desactualizado aunque los datos (y la firma de la vista) no
+        cambien; se repinta ya si es la pestaña visible, si no al seleccionarla."""
+        self._charts_dirty.add(key)
+        self._update_charts()
+
+    def _update_charts(self):
+        """Actualiza solo el chart de la pestaña visible si está marcado como desactualizado."""
+        try:
+            tab = self.charts_nb.select()
+        except Exception:
+            tab = ""
+        if tab in self._charts_dirty:
+            self._charts_dirty.discard(tab)
+            self._chart_updaters[tab]()
         
 
     def refresh_data(self):
         try:
-            if self.running.get():
-                self.df_all = self.provider.fetch()
-                self.apply_dynamic_filters()
-                self.update_global_summaries()
-                
-                if self.popups_enabled.get() and self.df_all is not None and not self.df_all.empty:
-                    cfg = getattr(self, "cfg", None)
-                    th_pnl = getattr(cfg, "highlight_abs_pnl", 5000)
-                
-                    pnl_col = "PnL"
-                
-                    # Máscara de highlight (vectorizada)
-                    mask = pd.Series(False, index=self.df_all.index)
-                    if pnl_col in self.df_all.columns:
-                        mask |= self.df_all[pnl_col].abs() < th_pnl
-                
-                    alert_df = self.df_all[mask]
-                
-                    if not alert_df.empty:
-                        popup_df_simple(
-                            self.winfo_toplevel(),
-                            alert_df,
-                            name_col="symbol",   # ajusta si usas otro nombre
-                            isin_col="isin",
-                            pnl_col="pnl",
-                            ms=8000,             # duración (0/None = solo con OK)
-                            title="🚨 Trades destacados")
-
-             
-
+            # fetch en el worker; si el anterior sigue en curso no se encola otro
+            if self.running.get() and self._fetch_future is None:
+                self._fetch_future = self._executor.submit(self._fetch)
+                self.after(self._FETCH_POLL_MS, self._poll_fetch)
         except Exception:
             logger.exception("refresh_data failed")
         finally:
             self.after(self._safe_refresh_ms(), self.refresh_data)
 
+    def _poll_fetch(self):
+        """Recoge el resultado del fetch desde el hilo de Tk (Tk no es thread-safe)."""
+        fut = self._fetch_future
+        if fut is None:
+            return
+        if not fut.done():
+            self.after(self._FETCH_POLL_MS, self._poll_fetch)
+            return
+        self._fetch_future = None
+        try:
+            self._on_fetched(fut.result())
+        except Exception:
+            logger.exception("provider fetch failed")
+
+    def destroy(self):
+        # El worker del fetch no debe sobrevivir a la ventana ni retrasar la salida
+        try:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        except Exception:
+            pass
+        super().destroy()
+
+    def _on_fetched(self, df: pd.DataFrame):
+        try:
+            # Se asigna el frame nuevo tal cual (sin copiar): filtros, sort y charts siempre
+            # producen frames/arrays nuevos y nunca escriben sobre df_all
+            self.df_all = df = self._normalize_dtypes(df)
+            self.build_dynamic_filters(df)
+            self.apply_dynamic_filters()
+            self.update_global_summaries()
+                
+            if self.popups_enabled.get() and self.df_all is not None and not self.df_all.empty:
+                cfg = getattr(self, "cfg", None)
+                th_pnl = getattr(cfg, "highlight_abs_pnl", 5000)
+            
+                pnl_col = "PnL"
+            
+                # Máscara de highlight (vectorizada)
+                mask = pd.Series(False, index=self.df_all.index)
+                if pnl_col in self.df_all.columns:
+                    mask |= self.df_all[pnl_col].abs() < th_pnl
+            
+                alert_df = self.df_all[mask]
+            
+                if not alert_df.empty:
+                    popup_df_simple(
+                        self.winfo_toplevel(),
+                        alert_df,
+                        name_col="symbol",   # ajusta si usas otro nombre
+                        isin_col="isin",
+                        pnl_col="pnl",
+                        ms=8000,             # duración (0/None = solo con OK)
+                        title="🚨 Trades destacados")
+
+        except Exception:
+            logger.exception("_on_fetched failed")
+
     def _safe_refresh_ms(self) -> int:
         try: ms = int(self.refresh_ms.get())
         except Exception: ms = 5000
@@ -1145,12 +1537,25 @@ class TradesApp(tk.Tk):
                                                 initialfile="trades_filtered.csv")
             if path:
                 try:
-                    self.df_filtered[self.DISPLAY_COLS].to_csv(path, index=False)
+                    self._write_csv(self.df_filtered[self.DISPLAY_COLS], path)
                     messagebox.showinfo("Export CSV", f"Exported to:\n{path}"); logger.info("Exported CSV: %s", path)
                 except Exception as e:
                     logger.exception("CSV export failed"); messagebox.showerror("Export CSV", f"Error:\n{e}")
         except Exception:
             logger.exception("export_csv outer failed")
+
+    @staticmethod
+    def _write_csv(df: pd.DataFrame, path: str) -> None:
+        """to_csv de pandas salvo exports enormes. El writer de Arrow no da el mismo fichero (cabecera y
+        strings entre comillas, 308.0 -> 308), así que solo se usa donde el tiempo de to_csv pesa más."""
+        if PYARROW_OK and len(df) >= _ARROW_CSV_MIN_ROWS:
+            try:
+                pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), path,
+                                write_options=pacsv.WriteOptions(quoting_style="needed"))
+                return
+            except Exception:
+                logger.debug("pyarrow CSV export failed; falling back to pandas", exc_info=True)
+        df.to_csv(path, index=False)
         
 
     
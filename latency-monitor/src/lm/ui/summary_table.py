@@ -387,39 +387,43 @@ class CounterpartyVolumeTable(SummaryTable):
                 self.set_rows([])
                 return
 
+            import numpy as np
             import pandas as pd
 
-            df = df.copy()
-            df["qty"] = pd.to_numeric(df["qty"], errors="coerce").abs()
-            df["exec price"] = pd.to_numeric(df["exec price"], errors="coerce").abs()
-            df = df.dropna(subset=["qty", "exec price"])
-            if df.empty:
+            # Solo las columnas necesarias, como arrays (sin copiar el DataFrame entero)
+            qty = np.abs(pd.to_numeric(df["qty"], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan))
+            px = np.abs(pd.to_numeric(df["exec price"], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan))
+            valid = ~(np.isnan(qty) | np.isnan(px))
+            if not valid.any():
                 self.set_rows([])
                 return
 
             # volumen en dinero
-            df["vol"] = df["qty"] * df["exec price"]
+            vol = qty * px
 
-            # buckets a partir de bucket_col
-            vals_upper = df[self.bucket_col].astype(str).str.upper()
+            # buckets a partir de bucket_col: 0 = main1, 1 = main2, 2 = Other
             main1, main2 = self.main_values
             main1_u, main2_u = self.main_values_upper
-
-            df["bucket"] = "Other"
-            df.loc[vals_upper == main1_u, "bucket"] = main1
-            df.loc[vals_upper == main2_u, "bucket"] = main2
+            s_b = df[self.bucket_col]
+            if isinstance(s_b.dtype, pd.CategoricalDtype):
+                # upper() sobre las categorías, luego se indexa por código (-1/NaN -> Other)
+                up = np.asarray(s_b.cat.categories.astype(str).str.upper(), dtype=object)
+                cat_b = np.where(up == main2_u, 1, np.where(up == main1_u, 0, 2)).astype(np.int8)
+                bucket = np.append(cat_b, np.int8(2))[s_b.cat.codes.to_numpy()]  # código -1 -> último = Other
+            else:
+                up = s_b.astype(str).str.upper().to_numpy(dtype=object)
+                bucket = np.where(up == main2_u, 1, np.where(up == main1_u, 0, 2)).astype(np.int8)
 
             # agrupar
             g = (
-                df.groupby(["counterparty", "bucket"])["vol"]
+                pd.DataFrame({"counterparty": df["counterparty"].array[valid],
+                              "bucket": bucket[valid], "vol": vol[valid]})
+                  .groupby(["counterparty", "bucket"], observed=True)["vol"]
                   .sum()
                   .unstack("bucket", fill_value=0.0)
+                  .reindex(columns=[0, 1, 2], fill_value=0.0)
             )
-
-            # asegurar columnas
-            for c in [main1, main2, "Other"]:
-                if c not in g.columns:
-                    g[c] = 0.0
+            g.columns = [main1, main2, "Other"]
 
             g["total"] = g[main1] + g[main2] + g["Other"]
 
@@ -436,14 +440,15 @@ class CounterpartyVolumeTable(SummaryTable):
                 return f"{x*100:.1f}%"
 
             rows: List[List[Any]] = []
-            for cp, r in g.iterrows():
-                tot = float(r["total"])
+            # itertuples: tuplas planas (índice primero) en vez de una Series por fila
+            for cp, tot, vol1, vol2, vol_other in g[["total", main1, main2, "Other"]].itertuples(name=None):
+                tot = float(tot)
                 if tot <= 0:
                     continue
 
-                vol1 = float(r[main1])
-                vol2 = float(r[main2])
-                vol_other = float(r["Other"])
+                vol1 = float(vol1)
+                vol2 = float(vol2)
+                vol_other = float(vol_other)
 
                 pct1 = vol1 / tot
                 pct2 = vol2 / tot
@@ -0,0 +1,18 @@
+# src/lm/utils/decimate.py
+import numpy as np
+
+def m4_indices(x: np.ndarray, y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """Índices a pintar de una serie con x ordenado: por cada uno de n_buckets tramos de x
+    (≈ columnas de píxel) el primer, último, mínimo y máximo punto. Visualmente idéntico
+    a la serie completa a esa resolución; si ya hay pocos puntos, los devuelve todos."""
+    n = x.shape[0]
+    if n <= 4 * n_buckets:
+        return np.arange(n)
+    xi = x.astype(np.int64, copy=False)
+    span = int(xi[-1] - xi[0]) + 1
+    bucket = (xi - xi[0]) * n_buckets // span
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+    # por tramo (contiguo, ya que x está ordenado): orden por valor -> extremos en starts/ends
+    order = np.lexsort((y, bucket))
+    return np.unique(np.concatenate([starts, ends, order[starts], order[ends]]))
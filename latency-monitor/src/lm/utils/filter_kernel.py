@@ -0,0 +1,35 @@
+# src/lm/utils/filter_kernel.py
+import numpy as np
+from typing import Sequence
+from lm.utils.jit import numba_kernel, use_jit
+
+# numba es opcional: sin él (o con pocas filas) se usan máscaras de NumPy por columna
+@numba_kernel
+def _range_mask_jit(numba):
+    prange = numba.prange
+    @numba.njit(parallel=True, cache=True)
+    def kernel(cols, mins, maxs):
+        n = cols.shape[1]
+        mask = np.ones(n, dtype=np.bool_)
+        for i in prange(n):
+            for k in range(cols.shape[0]):
+                v = cols[k, i]
+                if not (v >= mins[k] and v <= maxs[k]):  # NaN tampoco pasa
+                    mask[i] = False
+                    break
+        return mask
+    return kernel
+
+def use_range_jit(n_rows: int) -> bool:
+    return use_jit(n_rows)
+
+def range_mask(cols: Sequence[np.ndarray], mins: Sequence[float], maxs: Sequence[float]) -> np.ndarray:
+    """mins[k] <= cols[k] <= maxs[k] para todas las k (±inf = sin límite), en una sola pasada por fila."""
+    n = cols[0].shape[0]
+    if use_range_jit(n):
+        stacked = np.vstack([np.asarray(c, dtype=np.float64) for c in cols])
+        return _range_mask_jit()(stacked, np.asarray(mins, dtype=np.float64), np.asarray(maxs, dtype=np.float64))
+    mask = np.ones(n, dtype=bool)
+    for c, lo, hi in zip(cols, mins, maxs):
+        mask &= (c >= lo) & (c <= hi)
+    return mask
@@ -0,0 +1,34 @@
+# src/lm/utils/histogram.py
+import numpy as np
+from lm.utils.jit import numba_kernel, use_jit
+
+# numba es opcional: sin él se usa np.bincount
+@numba_kernel
+def _bin_counts_jit(numba):
+    @numba.njit(cache=True)
+    def kernel(values, vmin, binw, nbins):
+        counts = np.zeros(nbins, dtype=np.int64)
+        for i in range(values.shape[0]):
+            b = np.floor((values[i] - vmin) / binw)
+            if 0 <= b < nbins:  # NaN no cumple ninguna de las dos
+                counts[int(b)] += 1
+        return counts
+    return kernel
+
+def bin_counts(values: np.ndarray, vmin: float, binw: float, nbins: int) -> np.ndarray:
+    """Cuenta valores en nbins bins de ancho binw desde vmin; fuera de rango (o NaN) se ignora."""
+    values = np.asarray(values)
+    if use_jit(values.shape[0]):
+        return _bin_counts_jit()(values, float(vmin), float(binw), int(nbins))
+    if values.dtype.kind in "iu" and float(vmin).is_integer() and float(binw).is_integer():
+        # bins enteros (p. ej. segundos epoch): índice con aritmética entera, sin pasar a float
+        b = (values.astype(np.int64, copy=False) - int(vmin)) // int(binw)
+    else:
+        b = np.floor((values.astype(np.float64, copy=False) - vmin) / binw)
+    b = b[(b >= 0) & (b < nbins)].astype(np.int64, copy=False)
+    return np.bincount(b, minlength=nbins).astype(np.int64, copy=False)
+
+def cum_bin_counts(values: np.ndarray, vmin: float, binw: float, nbins: int) -> np.ndarray:
+    """np.cumsum(bin_counts(...)) sobre el mismo buffer (conteo acumulado por bin)."""
+    counts = bin_counts(values, vmin, binw, nbins)
+    return np.cumsum(counts, out=counts)
@@ -0,0 +1,31 @@
+# src/lm/utils/jit.py
+# numba es opcional y caro de importar (~0.25 s): solo se importa la primera vez que un kernel
+# se usa de verdad (frames de NUMBA_MIN_ROWS filas o más). Con pocas filas ni se toca.
+NUMBA_MIN_ROWS = 100_000
+
+_numba = None  # None = aún no se intentó; False = no instalado
+
+def _numba_module():
+    global _numba
+    if _numba is None:
+        try:
+            import numba
+            _numba = numba
+        except Exception:
+            _numba = False
+    return _numba or None
+
+def use_jit(n_rows: int) -> bool:
+    """True si n_rows justifica un kernel numba y numba está disponible (lo importa en la primera consulta)."""
+    return n_rows >= NUMBA_MIN_ROWS and _numba_module() is not None
+
+def numba_kernel(build):
+    """Decorador para fábricas de kernels: build(numba) devuelve la función compilada. Se construye
+    una sola vez, en la primera llamada; llamar solo tras use_jit(n)."""
+    kernel = None
+    def get():
+        nonlocal kernel
+        if kernel is None:
+            kernel = build(_numba_module())
+        return kernel
+    return get
@@ -1,20 +1,38 @@
 # src/lm/utils/numbers.py
+from functools import lru_cache
 from typing import Optional
 
-def safe_float(s: str, default: Optional[float] = None) -> Optional[float]:
+def _safe_float_impl(s: str, default: Optional[float] = None) -> Optional[float]:
     try:
         if s is None: return default
         return float(str(s).replace(",", ".").strip())
     except Exception:
         return default
 
-def safe_int(s: str, default: Optional[int] = None) -> Optional[int]:
+def _safe_int_impl(s: str, default: Optional[int] = None) -> Optional[int]:
     try:
         if s is None: return default
         return int(str(s).strip())
     except Exception:
         return default
 
+# Los textos de los Entry se repiten en cada refresco/tecla: parseo memoizado.
+# typed=True para que 1, 1.0 y True no compartan entrada.
+_safe_float_cached = lru_cache(maxsize=1024, typed=True)(_safe_float_impl)
+_safe_int_cached = lru_cache(maxsize=1024, typed=True)(_safe_int_impl)
+
+def safe_float(s: str, default: Optional[float] = None) -> Optional[float]:
+    try:
+        return _safe_float_cached(s, default)
+    except TypeError:  # argumento no hashable
+        return _safe_float_impl(s, default)
+
+def safe_int(s: str, default: Optional[int] = None) -> Optional[int]:
+    try:
+        return _safe_int_cached(s, default)
+    except TypeError:
+        return _safe_int_impl(s, default)
+
 def signed_text(value: float, zero: str = "0") -> str:
     if value > 0: return f"+{value:.0f}"
     if value < 0: return f"−{abs(value):.0f}"
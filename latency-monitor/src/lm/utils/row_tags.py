@@ -0,0 +1,24 @@
+# src/lm/utils/row_tags.py
+import numpy as np
+from lm.utils.jit import numba_kernel, use_jit
+
+# código -> tag del Treeview
+ROW_TAGS = ("ROW_EVEN", "ROW_ODD", "HL")
+
+# numba es opcional: sin él (o con pocas filas) se usa np.where
+@numba_kernel
+def _row_tag_codes_jit(numba):
+    @numba.njit(cache=True)
+    def kernel(qty, pnl, hl_qty, hl_pnl):
+        out = np.empty(qty.shape[0], dtype=np.int8)
+        for i in range(qty.shape[0]):
+            out[i] = 2 if (qty[i] > hl_qty and pnl[i] > hl_pnl) else (i & 1)
+        return out
+    return kernel
+
+def row_tag_codes(qty: np.ndarray, pnl: np.ndarray, hl_qty: float, hl_pnl: float) -> np.ndarray:
+    """Código por fila (índice en ROW_TAGS): 2 si qty > hl_qty y pnl > hl_pnl, si no paridad de la fila."""
+    n = qty.shape[0]
+    if use_jit(n):
+        return _row_tag_codes_jit()(qty, pnl, float(hl_qty), float(hl_pnl))
+    return np.where((qty > hl_qty) & (pnl > hl_pnl), 2, np.arange(n) & 1).astype(np.int8)